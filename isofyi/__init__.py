@@ -23,6 +23,10 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Increase when parsing changes, so cached data (see
+# kamusi.yi_compare.load_dictionary()) is parsed again
+PARSER_VERSION = 1
+
 YiddishAdjective = namedtuple("YiddishAdjective", ["word"])
 YiddishAdverb = namedtuple("YiddishAdverb", ["word"])
 YiddishConjunction = namedtuple("YiddishConjunction", ["word"])
@@ -50,24 +54,90 @@ def get_yiddish(entry):
     return hebr
 
 
+class IsofRecord:
+    """
+    The fields of an entry of the JSON data that we use
+    """
+
+    __slots__ = ("id", "graminfo", "yiddish")
+
+    def __init__(self, id, graminfo, yiddish):  # pylint: disable=redefined-builtin
+        self.id = id
+        self.graminfo = graminfo
+        self.yiddish = yiddish
+
+    @classmethod
+    def from_entry(cls, entry):
+        """
+        Create a record from an entry of the JSON data
+        """
+        return cls(int(entry["ID"]), get_graminfo(entry), get_yiddish(entry))
+
+    def __repr__(self):
+        return f"IsofRecord({self.id!r}, {self.graminfo!r}, {self.yiddish!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, IsofRecord):
+            return (self.id, self.graminfo, self.yiddish) == (
+                other.id,
+                other.graminfo,
+                other.yiddish,
+            )
+        return False
+
+
+def iter_json_array(stream, chunk_size=1 << 16):
+    """
+    Yield the items of a JSON array from a text stream one by one,
+    without reading the whole file first
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+    while True:
+        # Skip whitespace and the array syntax between items
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+            if buffer[pos] == "[":
+                started = True
+            pos += 1
+        if pos < len(buffer) and started:
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+                yield item
+                continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        elif eof:
+            return
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
 def get_data(json_file):
     """
-    Get all the data from the JSON file
+    Get all the data from the JSON file as IsofRecord objects.  The
+    file is read incrementally, so the first records are available
+    before the whole file has been read.
     """
     with open(json_file, "r", encoding="utf-8") as stream:
-        for entry in json.load(stream):
+        for entry in iter_json_array(stream):
             if not get_graminfo(entry):
                 continue
-            yield entry
+            yield IsofRecord.from_entry(entry)
 
 
 def get_entry_by_id(data, number):
     """
-    Get a specific entry from the JSON data by ID
+    Get a specific record from the data by ID
     """
-    for entry in data:
-        if int(entry["ID"]) == number:
-            return entry
+    for record in data:
+        if record.id == number:
+            return record
     return None
 
 
@@ -188,21 +258,21 @@ parse_func = {
 }
 
 
-def parse_word(entry):
+def parse_word(record):
     """
-    Parse JSON data according to the word type
+    Parse a record according to the word type
     """
-    return parse_func[get_graminfo(entry)](get_yiddish(entry))
+    return parse_func[record.graminfo](record.yiddish)
 
 
 def get_words(data):
     """
     Get all words in proper Python data structure
     """
-    for entry in data:
-        if get_graminfo(entry) not in parse_func:
+    for record in data:
+        if record.graminfo not in parse_func:
             continue
-        yield parse_word(entry)
+        yield parse_word(record)
 
 
 def get_adjectives(words):
@@ -252,3 +322,73 @@ def get_verbs(words):
     Get all verbs
     """
     return filter(lambda x: isinstance(x, YiddishVerb), words)
+
+
+class IsofDictionary:
+    """
+    The words of the ISOF dictionary, indexed by word and by part of
+    speech (graminfo), and the records, indexed by ID.  A word can have
+    several senses, so looking up a word returns a list.
+    """
+
+    def __init__(self, data):
+        self.records = {}
+        self.words = []
+        self.by_word = {}
+        self.by_pos = {}
+        for record in data:
+            self.records[record.id] = record
+            if record.graminfo not in parse_func:
+                continue
+            word = parse_word(record)
+            if not word:
+                continue
+            self.words.append(word)
+            self.by_word.setdefault(word.word, []).append(word)
+            self.by_pos.setdefault(record.graminfo, []).append(word)
+
+    @classmethod
+    def from_file(cls, json_file):
+        """
+        Load the dictionary from the JSON file
+        """
+        return cls(get_data(json_file))
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.by_word
+
+    def get_entry_by_id(self, number):
+        """
+        Get a specific record by ID
+        """
+        return self.records.get(number)
+
+    def get_words(self, word):
+        """
+        Get all senses of a word
+        """
+        return self.by_word.get(word, [])
+
+    def get_pos(self, graminfo):
+        """
+        Get all words of a part of speech, e.g. "s" for nouns
+        """
+        return self.by_pos.get(graminfo, [])
+
+    def get_nouns(self):
+        """
+        Get all nouns
+        """
+        return self.get_pos("s")
+
+    def get_verbs(self):
+        """
+        Get all verbs
+        """
+        return self.get_pos("vb")
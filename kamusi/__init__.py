@@ -1,6 +1,12 @@
+from .cache import *
+from .commons import *
+from .corpus import *
 from .diff import *
 from .edit import *
 from .entry import *
 from .hyph import *
+from .hyphenator import *
 from .lang import *
+from .parallel import *
 from .save import *
+from .translations import *
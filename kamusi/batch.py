@@ -0,0 +1,309 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Functions to run a fix over many pages
+
+A fixer is a function that takes an entry (and optionally the page
+title first) and returns the new entry, either as a string or as a
+generator of lines.  A fixer can also return a (new entry, changelog)
+tuple to use a changelog that depends on the change.
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from collections import deque, namedtuple
+from functools import partial
+import importlib.machinery
+import importlib.util
+from pathlib import Path
+import queue
+import re
+import sys
+import threading
+
+import click
+import pywikibot
+from pywikibot import pagegenerators
+
+import kamusi
+
+Change = namedtuple("Change", ["page", "old_text", "new_text", "changelog"], defaults=[None])
+
+
+def batch_options(func):
+    """
+    Decorator adding the options to select pages and to run without
+    prompting to a click command
+    """
+    options = [
+        click.argument("pages", nargs=-1),
+        click.option(
+            "--file",
+            "filename",
+            type=click.Path(exists=True, dir_okay=False, path_type=Path),
+            help="File with one page title per line",
+        ),
+        click.option("--category", help="Process all pages in this category"),
+        click.option("--yes", is_flag=True, help="Store all edits without asking"),
+        click.option("--jobs", type=int, help="Number of worker processes"),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def load_fixer(spec):
+    """
+    Load a fixer function from a script, given as "path:function"
+    (e.g. "fixes/translations/fix_syntax_errors:fix_trans_syntax")
+    """
+    path, name = spec.rsplit(":", 1)
+    module_name = "kamusi_fixer_" + re.sub(r"\W", "_", Path(path).name)
+    loader = importlib.machinery.SourceFileLoader(module_name, path)
+    module = importlib.util.module_from_spec(
+        importlib.util.spec_from_loader(module_name, loader)
+    )
+    # Register the module so the fixer can be pickled for worker processes
+    sys.modules[module_name] = module
+    loader.exec_module(module)
+    return getattr(module, name)
+
+
+def get_titles(site, pages=(), filename=None, category=None):
+    """
+    Get page titles from the command line, a file and a category
+    """
+    titles = list(pages)
+    if filename:
+        with open(filename, "r", encoding="utf-8") as title_fp:
+            titles.extend(line.strip() for line in title_fp if line.strip())
+    if category:
+        titles.extend(
+            page.title() for page in pywikibot.Category(site, category).articles()
+        )
+    return titles
+
+
+def preload_pages(site, titles, groupsize=50):
+    """
+    Fetch the text of many pages with as few API requests as possible
+    """
+    pages = (pywikibot.Page(site, title) for title in titles)
+    return pagegenerators.PreloadingGenerator(pages, groupsize=groupsize)
+
+
+def apply_fixer(fixer, pass_title, item):
+    """
+    Run a fixer on a (title, entry) tuple and return a (new entry,
+    changelog) tuple.  The changelog is None unless the fixer provides
+    one.  The new entry is None if the fixer can't handle the entry.
+    """
+    title, entry = item
+    try:
+        result = fixer(title, entry) if pass_title else fixer(entry)
+    except (ValueError, NotImplementedError) as e:
+        print(f"{title}: {e}")
+        return None, None
+    if isinstance(result, tuple):
+        return result
+    return "".join(result), None
+
+
+def get_change(fixer, page, lang, pass_title=False):
+    """
+    Run the fixer on the entry of a page in this process.  Returns a
+    Change, or None if the page has no entry for the language.
+    """
+    entry = kamusi.get_entry(page.text, lang, site=page.site.code)
+    if not entry:
+        return None
+    return Change(page, entry, *apply_fixer(fixer, pass_title, (page.title(), entry)))
+
+
+def compute_changes(fixer, site, titles, lang, pass_title=False, jobs=None, executor=None):
+    """
+    Fetch pages in bulk and run the fixer on their entries in worker
+    processes (of executor if given, see kamusi.start_pool()).  Yields
+    a Change for every page in input order.  Pages are only fetched as
+    fast as the changes are consumed.
+    """
+    pending = deque()
+
+    def get_items():
+        for page in preload_pages(site, titles):
+            entry = kamusi.get_entry(page.text, lang, site=site.code)
+            if not entry:
+                print(f"No page {page.title()} for language {lang}")
+                continue
+            pending.append((page, entry))
+            yield page.title(), entry
+
+    func = partial(apply_fixer, fixer, pass_title)
+    results = kamusi.imap_ordered(func, get_items(), jobs=jobs, executor=executor)
+    for new_text, changelog in results:
+        page, old_text = pending.popleft()
+        yield Change(page, old_text, new_text, changelog)
+
+
+def prefetch_ahead(iterable, ahead):
+    """
+    Consume an iterable in a background thread, keeping up to ahead
+    items ready.  Exceptions are re-raised in the caller.
+    """
+    items = queue.Queue(maxsize=ahead)
+    done = object()
+
+    def fill():
+        try:
+            for item in iterable:
+                items.put((item, None))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            items.put((done, e))
+        else:
+            items.put((done, None))
+
+    threading.Thread(target=fill, daemon=True).start()
+    while True:
+        item, error = items.get()
+        if error is not None:
+            raise error
+        if item is done:
+            return
+        yield item
+
+
+class SaveWorker(threading.Thread):
+    """
+    Store edits in a background thread so the review loop doesn't
+    wait for the network.
+
+    Edits are stored one at a time, so pywikibot's edit throttle
+    applies as usual.  If the page was changed in the meantime, the
+    fixer is run again on the current text (via rebase) before
+    retrying.  The rebased change is stored without being shown, so
+    only pass rebase if all edits are stored without asking; otherwise
+    the edit fails.  Edits that can't be stored for any reason are
+    listed in failed.
+    """
+
+    def __init__(self, changelog, minor=False, rebase=None, retries=3):
+        super().__init__(daemon=True)
+        self.changelog = changelog
+        self.minor = minor
+        self.rebase = rebase
+        self.retries = retries
+        self.failed = []
+        self._queue = queue.Queue()
+
+    def submit(self, change):
+        """
+        Queue a change to be stored
+        """
+        self._queue.put(change)
+
+    def close(self):
+        """
+        Wait until all queued changes have been stored
+        """
+        self._queue.put(None)
+        self.join()
+
+    def run(self):
+        while (change := self._queue.get()) is not None:
+            try:
+                saved = self._save(change)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Don't let one edit stop the worker and the edits after it
+                print(f"Can't save {change.page.title()}: {e}")
+                saved = False
+            if not saved:
+                self.failed.append(change.page.title())
+
+    def _save(self, change):
+        for _ in range(self.retries + 1):
+            page = change.page
+            if change.old_text in page.text:
+                page.text = page.text.replace(change.old_text, change.new_text)
+                try:
+                    page.save(change.changelog or self.changelog, minor=self.minor)
+                    return True
+                except pywikibot.exceptions.EditConflictError:
+                    pass
+                except pywikibot.exceptions.Error as e:
+                    print(f"Can't save {page.title()}: {e}")
+                    return False
+            if self.rebase is None:
+                break
+            # Fetch the current text and run the fixer on it again
+            del page.text
+            page.get(force=True)
+            change = self.rebase(page)
+            if change is None or change.new_text is None:
+                break
+            if change.old_text == change.new_text:
+                return True
+        print(f"Edit conflict, not saved: {change.page.title()}")
+        return False
+
+
+def review_changes(changes, saver, yes=False):
+    """
+    Show the diff of every change and queue it for saving if confirmed
+    """
+    for change in changes:
+        if change.new_text is None:
+            continue
+        if change.old_text == change.new_text:
+            print(f"No change: {change.page.title()}")
+            continue
+        print(change.page.title())
+        # Don't write colour codes to logs
+        print(kamusi.colour_diff(change.old_text, change.new_text, colour=sys.stdout.isatty()))
+        if not yes:
+            edit = input("Store edit (Y/n): ")
+            if edit.upper() == "N":
+                continue
+        saver.submit(change)
+
+
+def run_batch(
+    fixer,
+    site,
+    titles,
+    lang,
+    changelog,
+    minor=False,
+    yes=False,
+    jobs=None,
+    pass_title=False,
+    ahead=10,
+):
+    """
+    Run a fixer over many pages and review the changes in order.
+
+    The next pages are fetched and fixed while the current diff is
+    reviewed, and approved edits are stored in the background.  Edits
+    that conflict with a newer revision are only redone on the current
+    text with yes, since the new diff can't be reviewed.
+    """
+    # Fork the worker processes before any thread is started
+    executor = kamusi.start_pool(jobs)
+    try:
+        changes = compute_changes(fixer, site, titles, lang, pass_title, jobs, executor)
+        rebase = None
+        if yes:
+            rebase = partial(get_change, fixer, lang=lang, pass_title=pass_title)
+        saver = SaveWorker(changelog, minor, rebase=rebase)
+        saver.start()
+        try:
+            review_changes(prefetch_ahead(changes, ahead), saver, yes)
+        finally:
+            print("Waiting for pending edits to be stored...")
+            saver.close()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    if saver.failed:
+        print("Not saved:", ", ".join(saver.failed))
@@ -0,0 +1,57 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Functions to cache data on disk
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+import os
+from pathlib import Path
+import pickle
+
+
+def get_cache_dir(name="kamusi"):
+    """
+    Return the directory in which data is cached
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / name
+
+
+def write_cache_file(cache_file, data):
+    """
+    Write data (bytes or str) to a cache file.  The data is written to
+    a temporary file first, so readers never see a partial file.
+    """
+    cache_file = Path(cache_file)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        if isinstance(data, bytes):
+            tmp_file.write_bytes(data)
+        else:
+            tmp_file.write_text(data, encoding="utf-8")
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Can't write cache {cache_file}: {e}")
+
+
+def load_cached(cache_file, key, build):
+    """
+    Return the object cached in cache_file if it was stored with the
+    same key.  Otherwise, call build() to create the object and cache
+    it with the key.
+    """
+    try:
+        with open(cache_file, "rb") as cache_fp:
+            cached_key, value = pickle.load(cache_fp)
+        if cached_key == key:
+            return value
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        pass
+    value = build()
+    write_cache_file(cache_file, pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL))
+    return value
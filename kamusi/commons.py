@@ -0,0 +1,162 @@
+# Copyright (C) 2026  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Functions to check whether files exist on Wikimedia Commons
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+import gzip
+import json
+from pathlib import Path
+import time
+
+import requests
+
+from .cache import get_cache_dir, write_cache_file
+
+COMMONS_API = "https://commons.wikimedia.org/w/api.php"
+COMMONS_USER_AGENT = "kamusi (https://github.com/tbm/wiktionary-tools)"
+
+# Maximum number of titles per API query
+COMMONS_QUERY_LIMIT = 50
+
+# Number of seconds after which a cached result is checked again
+COMMONS_CACHE_TTL = 7 * 24 * 60 * 60
+
+COMMONS_CACHE_VERSION = 1
+
+
+def normalize_file_title(title):
+    """
+    Return a file name in the form used by MediaWiki (without the
+    File: prefix, spaces instead of underscores, first letter in
+    upper case)
+    """
+    title = title.strip()
+    for namespace in ("File:", "Image:"):
+        title = title.removeprefix(namespace)
+    title = title.replace("_", " ").strip()
+    return title[:1].upper() + title[1:]
+
+
+def read_file_list(filename, prefix=None):
+    """
+    Read a list of Commons file names with one name per line (e.g.
+    commonswiki-latest-all-titles-in-ns6.gz from the dumps), optionally
+    only the names starting with prefix.  Returns a set of normalized
+    names.
+    """
+    filename = Path(filename)
+    opener = gzip.open if filename.suffix == ".gz" else open
+    files = set()
+    with opener(filename, "rt", encoding="utf-8") as list_fp:
+        for line in list_fp:
+            title = normalize_file_title(line)
+            if not title or title == "Page title":
+                continue
+            if prefix and not title.startswith(prefix):
+                continue
+            files.add(title)
+    return files
+
+
+class CommonsResolver:
+    """
+    Check whether files exist on Wikimedia Commons.
+
+    Up to COMMONS_QUERY_LIMIT files are checked with one API query and
+    the results are stored in a JSON cache for ttl seconds.  If a set
+    of file names is given as offline (see read_file_list()), it is
+    used instead of the API.
+    """
+
+    def __init__(self, cache_file=None, ttl=COMMONS_CACHE_TTL, offline=None, session=None):
+        self.cache_file = Path(cache_file or get_cache_dir() / "commons.json")
+        self.ttl = ttl
+        self.offline = offline
+        self.session = session
+        self.cache = self._load_cache() if offline is None else {}
+
+    def _load_cache(self):
+        """
+        Load the cached results, mapping file names to (exists,
+        timestamp) lists
+        """
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as cache_fp:
+                data = json.load(cache_fp)
+            if data.get("version") == COMMONS_CACHE_VERSION:
+                return data["files"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
+
+    def save(self):
+        """
+        Store the cached results
+        """
+        data = {"version": COMMONS_CACHE_VERSION, "files": self.cache}
+        write_cache_file(self.cache_file, json.dumps(data))
+
+    def _query(self, titles):
+        """
+        Check up to COMMONS_QUERY_LIMIT files with one API query.
+        Returns a dict mapping the file names to True or False.
+        """
+        if self.session is None:
+            self.session = requests.Session()
+            self.session.headers["User-Agent"] = COMMONS_USER_AGENT
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "titles": "|".join("File:" + title for title in titles),
+        }
+        response = self.session.get(COMMONS_API, params=params, timeout=30)
+        response.raise_for_status()
+        query = response.json().get("query", {})
+        renamed = {item["from"]: item["to"] for item in query.get("normalized", [])}
+        pages = {
+            page["title"]: not page.get("missing") and not page.get("invalid")
+            for page in query.get("pages", [])
+        }
+        result = {}
+        for title in titles:
+            name = "File:" + title
+            result[title] = pages.get(renamed.get(name, name), False)
+        return result
+
+    def check(self, titles):
+        """
+        Return a dict mapping the given file names to True if they
+        exist on Commons and False otherwise
+        """
+        names = {title: normalize_file_title(title) for title in titles}
+        if self.offline is not None:
+            return {title: name in self.offline for title, name in names.items()}
+        now = time.time()
+        missing = sorted(
+            {
+                name
+                for name in names.values()
+                if name not in self.cache or now - self.cache[name][1] > self.ttl
+            }
+        )
+        try:
+            for i in range(0, len(missing), COMMONS_QUERY_LIMIT):
+                result = self._query(missing[i : i + COMMONS_QUERY_LIMIT])
+                for name, exists in result.items():
+                    self.cache[name] = [exists, now]
+        finally:
+            if missing:
+                self.save()
+        return {title: self.cache[name][0] for title, name in names.items()}
+
+    def exists(self, title):
+        """
+        Check whether a file exists on Commons
+        """
+        return self.check([title])[title]
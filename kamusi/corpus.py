@@ -0,0 +1,51 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Functions to work with a local corpus of entries, i.e. a directory
+with one file per page as written by download/download
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+import csv
+
+
+def title_to_filename(title):
+    """
+    Return the name of the file in which an entry is stored
+    """
+    return title.replace("/", "_")
+
+
+def filename_to_title(name):
+    """
+    Return the title of the entry stored in a file (the reverse of
+    title_to_filename(), since titles never contain underscores)
+    """
+    return name.replace("_", "/")
+
+
+def iter_corpus(directory):
+    """
+    Yield (name, entry) for all entries in the directory
+    """
+    for filepath in sorted(directory.glob("*")):
+        if not filepath.is_file():
+            continue
+        with open(filepath, "r", encoding="utf-8") as entry_fp:
+            yield filepath.name, entry_fp.read()
+
+
+def read_revids(filename):
+    """
+    Read a TSV file with page titles and revision IDs (as written by
+    download/download --revids).  Returns a dict mapping file names to
+    (title, revid) tuples.
+    """
+    revids = {}
+    with open(filename, "r", encoding="utf-8", newline="") as csvfile:
+        for title, revid in csv.reader(csvfile, delimiter="\t"):
+            revids[title_to_filename(title)] = (title, int(revid))
+    return revids
@@ -8,6 +8,13 @@ License unknown
 """
 
 import difflib
+import re
+import time
+
+RE_WORD = re.compile(r"\w+|\s+|[^\w\s]")
+
+# Changed hunks larger than this (in characters) are shown as lines
+REFINE_LIMIT = 20000
 
 
 def red(text):
@@ -30,19 +37,84 @@ def white(text):
     return f"\033[38;2;255;255;255m{text}\033[38;2;255;255;255m"
 
 
-def colour_diff(old, new):
+def deleted(text):
+    """Mark deleted text without colours"""
+    return f"[-{text}-]"
+
+
+def inserted(text):
+    """Mark inserted text without colours"""
+    return f"{{+{text}+}}"
+
+
+def plain(text):
+    """Leave text as it is"""
+    return text
+
+
+def _refine(old, new, granularity, fmt_equal, fmt_delete, fmt_insert):
     """
-    Return colour diff
+    Diff a changed hunk by words or characters
     """
-    result = ""
-    codes = difflib.SequenceMatcher(a=old, b=new).get_opcodes()
-    for code in codes:
-        if code[0] == "equal":
-            result += white(old[code[1] : code[2]])
-        elif code[0] == "delete":
-            result += red(old[code[1] : code[2]])
-        elif code[0] == "insert":
-            result += green(new[code[3] : code[4]])
-        elif code[0] == "replace":
-            result += red(old[code[1] : code[2]]) + green(new[code[3] : code[4]])
+    if granularity == "word":
+        old = RE_WORD.findall(old)
+        new = RE_WORD.findall(new)
+    result = []
+    for code, i1, i2, j1, j2 in difflib.SequenceMatcher(a=old, b=new).get_opcodes():
+        if code == "equal":
+            result.append(fmt_equal("".join(old[i1:i2])))
+        if code in ("delete", "replace"):
+            result.append(fmt_delete("".join(old[i1:i2])))
+        if code in ("insert", "replace"):
+            result.append(fmt_insert("".join(new[j1:j2])))
     return result
+
+
+def colour_diff(old, new, context=None, granularity="char", timeout=None, colour=True):
+    """
+    Return colour diff
+
+    The texts are compared line by line first and only the changed
+    lines are compared by granularity ("char", "word" or "line").  If
+    context is given, only that many unchanged lines are shown around
+    every change.  If timeout (in seconds) is given and has passed,
+    the remaining changes are shown as whole lines.  With colour set
+    to False, changes are marked as [-deleted-] and {+inserted+}.
+    """
+    if colour:
+        fmt_equal, fmt_delete, fmt_insert, fmt_skip = white, red, green, blue
+    else:
+        fmt_equal, fmt_delete, fmt_insert, fmt_skip = plain, deleted, inserted, plain
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    codes = difflib.SequenceMatcher(a=old_lines, b=new_lines, autojunk=False).get_opcodes()
+    result = []
+    for n, (code, i1, i2, j1, j2) in enumerate(codes):
+        old_text = "".join(old_lines[i1:i2])
+        new_text = "".join(new_lines[j1:j2])
+        if code == "equal":
+            if context is not None:
+                head = old_lines[i1 : i1 + context] if n > 0 else []
+                tail = old_lines[i2 - context : i2] if n < len(codes) - 1 and context else []
+                skipped = i2 - i1 - len(head) - len(tail)
+                if skipped > 0:
+                    result.append(fmt_equal("".join(head)))
+                    result.append(fmt_skip(f"@@ {skipped} unchanged lines @@\n"))
+                    old_text = "".join(tail)
+            result.append(fmt_equal(old_text))
+        elif (
+            code == "replace"
+            and granularity != "line"
+            and len(old_text) + len(new_text) <= REFINE_LIMIT
+            and (deadline is None or time.monotonic() < deadline)
+        ):
+            result.extend(
+                _refine(old_text, new_text, granularity, fmt_equal, fmt_delete, fmt_insert)
+            )
+        else:
+            if old_text:
+                result.append(fmt_delete(old_text))
+            if new_text:
+                result.append(fmt_insert(new_text))
+    return "".join(result)
@@ -8,12 +8,15 @@ Functions related to hyphenation patterns
 
 __license__ = "GPL-3.0-or-later"
 
+from functools import lru_cache
 import re
 import string
 import unicodedata
 
 import mwparserfromhell
 
+PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
 
 def get_hyphenations_hyph(template):
     """
@@ -76,9 +79,23 @@ def get_hyphenations_tl(template):
         yield re.split(r"\||\.+|7", pattern)
 
 
-def get_hyphenations(entry):
+# Languages of templates which are only used for one language
+TEMPLATE_LANGS = {
+    "es-pr": "es",
+    "fi-p": "fi",
+    "fi-pronunciation": "fi",
+    "it-pr": "it",
+    "pl-p": "pl",
+    "tl-pr": "tl",
+}
+
+
+def get_lang_hyphenations(entry):
     """
-    Extract hyphenation patterns from a Wiktionary entry.
+    Extract hyphenation patterns from a Wiktionary entry or page and
+    yield (lang, pattern) tuples.  The language is taken from the first
+    parameter of {{hyph}} or from the name of language-specific
+    templates.
     """
     for line in entry.splitlines(keepends=True):
         # This is just a speed optimization over calling mwparserfromhell
@@ -102,8 +119,19 @@ def get_hyphenations(entry):
                     func = get_hyphenations_tl
                 case _:
                     continue
+            lang = TEMPLATE_LANGS.get(str(template.name))
+            if lang is None and template.params:
+                lang = str(template.params[0].value).strip()
             for hyph in func(template):
-                yield hyph
+                yield lang, hyph
+
+
+def get_hyphenations(entry):
+    """
+    Extract hyphenation patterns from a Wiktionary entry.
+    """
+    for _, hyph in get_lang_hyphenations(entry):
+        yield hyph
 
 
 def convert_german_kk_to_ck(hyph):
@@ -121,6 +149,7 @@ def convert_german_kk_to_ck(hyph):
     return result
 
 
+@lru_cache(maxsize=65536)
 def remove_diacritics(text):
     """
     Remove diacritics from a string
@@ -130,12 +159,12 @@ def remove_diacritics(text):
     return unicodedata.normalize("NFC", shaved)
 
 
+@lru_cache(maxsize=65536)
 def strip_punctuation(text):
     """
     Strip punctuation from a string
     """
-    translation_table = str.maketrans("", "", string.punctuation)
-    return text.translate(translation_table)
+    return text.translate(PUNCTUATION_TABLE)
 
 
 class Hyphenation:
@@ -174,19 +203,7 @@ class Hyphenation:
         """
         Instantiate the right subclass depending on the language
         """
-        lang_subclasses = {
-            "ca": HyphenationCA,
-            "de": HyphenationDE,
-            "hu": HyphenationHU,
-            "id": HyphenationID,
-            "it": HyphenationIT,
-            "nl": HyphenationNL,
-            "nn": HyphenationNN,
-            "sq": HyphenationSQ,
-            "tl": HyphenationTL,
-            "yi": HyphenationYI,
-        }
-        subclass = lang_subclasses.get(lang, cls)
+        subclass = LANG_SUBCLASSES.get(lang, cls)
         return subclass(word, hyph, lang)
 
     def is_valid(self):
@@ -377,3 +394,35 @@ class HyphenationYI(Hyphenation):
         if self.word.replace("־", "") == self.hyph_str:
             return True
         return False
+
+
+LANG_SUBCLASSES = {
+    "ca": HyphenationCA,
+    "de": HyphenationDE,
+    "hu": HyphenationHU,
+    "id": HyphenationID,
+    "it": HyphenationIT,
+    "nl": HyphenationNL,
+    "nn": HyphenationNN,
+    "sq": HyphenationSQ,
+    "tl": HyphenationTL,
+    "yi": HyphenationYI,
+}
+
+
+def validate_hyphenations(items):
+    """
+    Check many hyphenation patterns.  items is an iterable of (word,
+    patterns, lang) tuples, where patterns is an iterable of
+    hyphenation patterns (lists) for the word.  Yields a Hyphenation
+    for every pattern that doesn't match its word.
+    """
+    for word, patterns, lang in items:
+        subclass = LANG_SUBCLASSES.get(lang, Hyphenation)
+        for pattern in patterns:
+            # Most patterns match exactly
+            if "".join(pattern) == word:
+                continue
+            hyph = subclass(word, pattern, lang)
+            if not hyph.is_valid():
+                yield hyph
@@ -0,0 +1,150 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Hyphenate words with TeX (Liang) hyphenation patterns
+
+Pattern files are available from hyph-utf8, e.g.
+https://github.com/hyphenation/tex-hyphen/tree/master/hyph-utf8/tex/generic/hyph-utf8/patterns/txt
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+import re
+
+RE_TEX_BLOCK = re.compile(r"\\(patterns|hyphenation)\s*\{([^}]*)\}")
+RE_WORD_SEPARATOR = re.compile(r"(\s+|-)")
+
+# Key of the points of a pattern in the trie
+POINTS = None
+
+
+def parse_pattern(pattern):
+    """
+    Split a pattern such as "a1b" into its letters and the points
+    between them, e.g. ("ab", (0, 1, 0))
+    """
+    letters = []
+    points = [0]
+    for char in pattern:
+        if char.isdigit():
+            points[-1] = int(char)
+        else:
+            letters.append(char)
+            points.append(0)
+    return "".join(letters), tuple(points)
+
+
+def read_patterns(filename):
+    """
+    Read a pattern file and return a (patterns, exceptions) tuple.
+    Both plain pattern files (one pattern per line, as *.pat.txt in
+    hyph-utf8) and TeX files with \\patterns{} and \\hyphenation{}
+    are supported.
+    """
+    with open(filename, "r", encoding="utf-8") as pattern_fp:
+        text = "\n".join(line.split("%", 1)[0] for line in pattern_fp)
+    blocks = RE_TEX_BLOCK.findall(text)
+    if not blocks:
+        return text.split(), []
+    patterns = []
+    exceptions = []
+    for name, block in blocks:
+        if name == "patterns":
+            patterns.extend(block.split())
+        else:
+            exceptions.extend(block.split())
+    return patterns, exceptions
+
+
+class Hyphenator:
+    """
+    Hyphenate words with Liang's algorithm, as used by TeX.
+
+    The patterns are stored in a trie of nested dicts, so looking up
+    all patterns that match at a position of a word takes one dict
+    lookup per character.  left_min and right_min are the minimum
+    number of characters before the first and after the last break.
+    """
+
+    def __init__(self, patterns, exceptions=(), left_min=2, right_min=2):
+        self.left_min = left_min
+        self.right_min = right_min
+        self.trie = {}
+        for pattern in patterns:
+            letters, points = parse_pattern(pattern)
+            node = self.trie
+            for char in letters:
+                node = node.setdefault(char, {})
+            node[POINTS] = points
+        # Words with explicit hyphenations, e.g. "ta-ble"
+        self.exceptions = {}
+        for exception in exceptions:
+            word = exception.replace("-", "")
+            self.exceptions[word.lower()] = [
+                len(part) for part in exception.split("-")[:-1]
+            ]
+
+    @classmethod
+    def from_file(cls, filename, exceptions_file=None, left_min=2, right_min=2):
+        """
+        Create a hyphenator from a pattern file and an optional file
+        with exceptions (one hyphenated word per line, as *.hyp.txt
+        in hyph-utf8)
+        """
+        patterns, exceptions = read_patterns(filename)
+        if exceptions_file:
+            exceptions.extend(read_patterns(exceptions_file)[0])
+        return cls(patterns, exceptions, left_min, right_min)
+
+    def get_breaks(self, word):
+        """
+        Return the positions at which a single word can be hyphenated
+        """
+        lower = word.lower()
+        if lower in self.exceptions:
+            breaks = []
+            pos = 0
+            for length in self.exceptions[lower]:
+                pos += length
+                breaks.append(pos)
+            return breaks
+        chars = "." + lower + "."
+        points = [0] * (len(chars) + 1)
+        for start in range(len(chars)):
+            node = self.trie
+            for char in chars[start:]:
+                node = node.get(char)
+                if node is None:
+                    break
+                if POINTS in node:
+                    for i, point in enumerate(node[POINTS], start):
+                        if point > points[i]:
+                            points[i] = point
+        # points[i + 1] is the point before word[i]
+        return [
+            i
+            for i in range(self.left_min, len(word) - self.right_min + 1)
+            if points[i + 1] % 2
+        ]
+
+    def hyphenate(self, word):
+        """
+        Return the hyphenation of a word as a list of parts, like
+        kamusi.get_hyphenations().  Words of a phrase are hyphenated
+        separately.
+        """
+        result = [""]
+        for i, part in enumerate(RE_WORD_SEPARATOR.split(word)):
+            if i % 2:
+                # Separators stay within a part, as in {{hyph}}
+                result[-1] += part
+                continue
+            pos = 0
+            for pos_break in self.get_breaks(part):
+                result[-1] += part[pos:pos_break]
+                result.append("")
+                pos = pos_break
+            result[-1] += part[pos:]
+        return result
@@ -8,8 +8,20 @@ Functions related to languages and language codes.
 
 __license__ = "GPL-3.0-or-later"
 
+import csv
+from functools import lru_cache
+from pathlib import Path
+
 import mediawiki_langcodes
 
+from .cache import get_cache_dir, load_cached
+
+# Download CSV file from here:
+# https://en.wiktionary.org/wiki/Wiktionary:List_of_languages,_csv_format
+LANG_CSV = "Wiktionary:List_of_languages,_csv_format"
+# Increase when the format of LanguageIndex changes
+LANG_INDEX_VERSION = 1
+
 # Wiktionary-specific overrides
 LANG_MAP = {
     "ilo": "Ilocano",
@@ -25,6 +37,7 @@ LANG_MAP = {
 }
 
 
+@lru_cache(maxsize=None)
 def code_to_name(lang, site="en"):
     """
     Map a language code to a language name.
@@ -36,3 +49,175 @@ def code_to_name(lang, site="en"):
     if site == "sv":
         return lang_name.title()
     return lang_name
+
+
+class LanguageIndex:
+    """
+    Index of Wiktionary language names and codes.
+
+    Canonical names, other names and the LANG_MAP overrides are
+    indexed, so a name or code can be looked up in either direction
+    without a search.
+    """
+
+    def __init__(self):
+        # Canonical and other names to codes
+        self.name_codes = {}
+        # Codes to canonical names
+        self.code_names = {}
+
+    @classmethod
+    def from_csv(cls, filename):
+        """
+        Build the index from Wiktionary's list of languages in CSV
+        format
+        """
+        index = cls()
+        with open(filename, "r", encoding="utf-8") as csv_file:
+            reader = csv.DictReader(csv_file, delimiter=";")
+            for line in reader:
+                code = line["code"]
+                index.code_names[code] = line["canonical name"]
+                for lang in line["other names"].split(","):
+                    if lang.strip():
+                        index.name_codes.setdefault(lang.strip(), code)
+        # Canonical names win over other names
+        for code, lang in index.code_names.items():
+            index.name_codes[lang] = code
+        for code, lang in LANG_MAP.items():
+            index.code_names[code] = lang
+            index.name_codes[lang] = code
+        return index
+
+    def __contains__(self, lang):
+        return lang in self.name_codes
+
+    def get_code(self, lang):
+        """
+        Return the code of a language name or None
+        """
+        return self.name_codes.get(lang)
+
+    def get_name(self, code):
+        """
+        Return the canonical name of a language code or None
+        """
+        return self.code_names.get(code)
+
+
+def load_language_index(filename=LANG_CSV, cache_dir=None):
+    """
+    Load the language index for the CSV file.
+
+    The index is compiled once and stored in the cache directory.  It
+    is compiled again when the CSV file or the index format changes.
+    """
+    filename = Path(filename)
+    stat = filename.stat()
+    key = (LANG_INDEX_VERSION, str(filename.resolve()), stat.st_mtime_ns, stat.st_size)
+    cache_file = Path(cache_dir or get_cache_dir()) / "language-index.pickle"
+    return load_cached(cache_file, key, lambda: LanguageIndex.from_csv(filename))
+
+
+def osa_distance(a, b, max_distance=None):
+    """
+    Return the optimal string alignment distance between two strings
+    (Levenshtein distance plus transpositions of adjacent characters).
+
+    If max_distance is given, return max_distance + 1 as soon as the
+    distance is known to be larger.
+    """
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    # Only the part between a common prefix and suffix matters
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start : len(a) - end]
+    b = b[start : len(b) - end]
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        # Transpositions look back two rows
+        if (
+            max_distance is not None
+            and min(current) > max_distance
+            and min(previous) > max_distance
+        ):
+            return max_distance + 1
+        previous2, previous = previous, current
+    if max_distance is not None:
+        return min(previous[-1], max_distance + 1)
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    Index to find the closest names to a misspelled name.
+
+    This is a symmetric delete index: all strings which can be made
+    by deleting up to max_distance characters from the first
+    prefix_length characters of a name point to that name.  Deleting
+    characters from the misspelled name the same way gives a small
+    set of candidates, which are then checked with osa_distance().
+    Names are compared case-insensitively.
+    """
+
+    def __init__(self, names, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._names = {}
+        self._deletes = {}
+        self._cache = {}
+        for name in names:
+            key = name.casefold()
+            self._names.setdefault(key, name)
+        for key in self._names:
+            for delete in self._get_deletes(key):
+                self._deletes.setdefault(delete, []).append(key)
+
+    def _get_deletes(self, key):
+        """
+        Return all strings made by deleting up to max_distance
+        characters from the prefix of key
+        """
+        deletes = {key[: self.prefix_length]}
+        edits = deletes
+        for _ in range(self.max_distance):
+            edits = {edit[:i] + edit[i + 1 :] for edit in edits for i in range(len(edit))}
+            deletes |= edits
+        return deletes
+
+    def lookup(self, name):
+        """
+        Return a list of (name, distance) tuples for all names within
+        max_distance, closest names first
+        """
+        query = name.casefold()
+        candidates = set()
+        for delete in self._get_deletes(query):
+            candidates.update(self._deletes.get(delete, ()))
+        matches = []
+        for key in candidates:
+            distance = osa_distance(query, key, self.max_distance)
+            if distance <= self.max_distance:
+                matches.append((self._names[key], distance))
+        return sorted(matches, key=lambda match: (match[1], match[0]))
+
+    def suggest(self, name):
+        """
+        Return the closest name as a (name, distance) tuple or None
+        """
+        if name not in self._cache:
+            matches = self.lookup(name)
+            self._cache[name] = matches[0] if matches else None
+        return self._cache[name]
@@ -3,9 +3,12 @@ Wiktionary Page Abstraction
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Iterator
+from typing import List, Optional, Dict, Iterable, Iterator, Tuple
+from bisect import bisect_left, insort
 from dataclasses import dataclass
+from functools import lru_cache, partial
 import re
+import unicodedata
 
 from mwparserfromhell.nodes import Template
 import pywikibot
@@ -13,7 +16,8 @@ import mwparserfromhell
 from mwparserfromhell.wikicode import Wikicode
 from mediawiki_langcodes import name_to_code
 
-# import kamusi
+from .lang import code_to_name
+from .parallel import imap_ordered
 
 
 class WiktionaryEntry:
@@ -28,6 +32,15 @@ class WiktionaryEntry:
     def __str__(self):
         return str(self.content)
 
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], jobs: Optional[int] = None) -> Iterator["EntryModel"]:
+        """
+        Parse many entry texts (e.g. the files of a downloaded corpus)
+        in worker processes and yield an EntryModel for each of them,
+        in input order.
+        """
+        return imap_ordered(parse_entry_text, texts, jobs=jobs)
+
     def add_section(self, header: str, content: str, level: int = 3) -> None:
         """
         Add a new section to the entry.
@@ -188,6 +201,94 @@ class Also:
     def wikicode(self) -> Optional[Template]:
         return self._also
 
+@dataclass(frozen=True)
+class EntryModel:
+    """
+    Compact, picklable representation of a language entry.  It only
+    keeps the text and the section outline, so it can be passed
+    between processes cheaply.
+    """
+    lang_code: Optional[str]
+    lang_name: str
+    headings: Tuple[Tuple[int, str], ...]
+    text: str
+
+
+@dataclass(frozen=True)
+class PageModel:
+    """
+    Compact, picklable representation of a Wiktionary page.
+    """
+    title: str
+    site_lang: str
+    also: Tuple[str, ...]
+    entries: Tuple[EntryModel, ...]
+
+    def get_entry(self, lang_code: str) -> Optional[EntryModel]:
+        """
+        Get a specific language entry.
+        """
+        for entry in self.entries:
+            if entry.lang_code == lang_code:
+                return entry
+        return None
+
+
+@lru_cache(maxsize=None)
+def _lang_name_to_code(lang: str) -> Optional[str]:
+    """
+    Map the language name of a level 2 header to a language code.
+    """
+    if lang.startswith("{{"):
+        return lang.strip("{}")
+    return name_to_code(lang)
+
+
+@lru_cache(maxsize=None)
+def _collation_key(lang_code: str, site_lang: str) -> str:
+    """
+    Return a key to sort a language alphabetically by its name, ignoring
+    case and diacritics.
+    """
+    name = code_to_name(lang_code, site_lang) or lang_code
+    decomposed = unicodedata.normalize("NFD", name)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _make_entry_model(section: Wikicode) -> EntryModel:
+    headings = section.filter_headings()
+    lang_name = str(headings[0].title).strip() if headings else ""
+    return EntryModel(
+        lang_code=_lang_name_to_code(lang_name) if lang_name else None,
+        lang_name=lang_name,
+        headings=tuple((heading.level, str(heading.title).strip()) for heading in headings[1:]),
+        text=str(section),
+    )
+
+
+def parse_entry_text(text: str) -> EntryModel:
+    """
+    Parse the text of a single language entry into an EntryModel.
+    """
+    return _make_entry_model(mwparserfromhell.parse(text))
+
+
+def parse_page_text(site_lang: str, item: Tuple[str, str]) -> PageModel:
+    """
+    Parse a (title, text) tuple into a PageModel.  This does not need
+    access to the wiki, so it can run in a worker process.
+    """
+    title, text = item
+    parsed = mwparserfromhell.parse(text)
+    also = Also(site_lang, parsed).get() if parsed.get_sections([2]) else []
+    return PageModel(
+        title=title,
+        site_lang=site_lang,
+        also=tuple(also),
+        entries=tuple(_make_entry_model(section) for section in parsed.get_sections([2])),
+    )
+
+
 class WiktionaryPage(ABC):
     """
     Base class for Wiktionary pages across different language editions.
@@ -196,17 +297,21 @@ class WiktionaryPage(ABC):
     def __init__(self, title: str, site_lang: str, from_text: Optional[str] = None):
         self.title = title
         self.site_lang = site_lang
-        self.site = self._get_default_site()
-        self.page = pywikibot.Page(self.site, title)
+        # The site and page are only created when needed, so pages
+        # built from text (e.g. for testing) don't touch the network
+        self._site: Optional[pywikibot.site.APISite] = None
+        self._page: Optional[pywikibot.Page] = None
 
         # Control the pre-loaded content of the page,
         # such as for testing purposes.
-        if from_text is not None:
-            self.page.text = from_text
+        text = self.page.text if from_text is None else from_text
 
-        self._parsed = mwparserfromhell.parse(self.page.text)
+        self._parsed = mwparserfromhell.parse(text)
         self._also = Also(site_lang, self._parsed)
-        self.entries: List[WiktionaryEntry] = []
+        # Entries are indexed by language code; _order is kept sorted
+        # by _get_sort_key() so the page order never has to be rebuilt.
+        self._entries: Dict[str, WiktionaryEntry] = {}
+        self._order: List[Tuple[Tuple[int, str], str]] = []
 
         self.entry_factory = {
             "en": EnglishWiktionaryEntry,
@@ -214,9 +319,27 @@ class WiktionaryPage(ABC):
             "de": GermanWiktionaryEntry,
         }[site_lang]
 
-        if self.page.exists():
+        if from_text is not None or self.page.exists():
             self._parse_page()
 
+    @property
+    def site(self) -> pywikibot.site.APISite:
+        """
+        The site of the page
+        """
+        if self._site is None:
+            self._site = self._get_default_site()
+        return self._site
+
+    @property
+    def page(self) -> pywikibot.Page:
+        """
+        The pywikibot page
+        """
+        if self._page is None:
+            self._page = pywikibot.Page(self.site, self.title)
+        return self._page
+
     @classmethod
     def with_language_edition(cls, title: str, site_lang: str, from_text: Optional[str] = None):
         subclass = {"en": EnglishWiktionaryPage,
@@ -225,6 +348,16 @@ class WiktionaryPage(ABC):
                     }[site_lang](title, from_text=from_text)
         return subclass
 
+    @classmethod
+    def from_texts(cls, texts: Iterable[Tuple[str, str]], site_lang: str, jobs: Optional[int] = None) -> Iterator[PageModel]:
+        """
+        Parse many pages, given as (title, text) tuples, in worker
+        processes and yield a PageModel for each of them, in input
+        order.  Only a bounded number of pages is read ahead, so
+        texts can be a generator over a huge corpus.
+        """
+        return imap_ordered(partial(parse_page_text, site_lang), texts, jobs=jobs)
+
     def __repr__(self) -> str:
         # Use the parsed representation to get a reliable string form.
         return str(self._parsed)
@@ -242,53 +375,74 @@ class WiktionaryPage(ABC):
         """
 
     def _map_lang(self, lang: str) -> str:
-        if lang.startswith("{{"):
-            return lang.strip("{}")
-        return name_to_code(lang)
+        return _lang_name_to_code(lang)
+
+    def _get_sort_key(self, lang_code: str) -> Tuple[int, str]:
+        """
+        Return the key by which entries are ordered on the page: first
+        by language priority, then alphabetically by language name.
+        """
+        return self._get_language_sort_key(lang_code), _collation_key(lang_code, self.site_lang)
 
     def _parse_page(self) -> None:
         """
         Parse the page content into also links and language entries.
         """
         for language_entry in self._parsed.get_sections([2]):
-            self.entries.append(self.entry_factory(self.site_lang, language_entry))
+            lang_name = str(language_entry.filter_headings()[0].title).strip()
+            lang_code = self._map_lang(lang_name) or lang_name
+            self.add_entry(self.entry_factory(lang_code, language_entry))
 
     def _sort_entries(self) -> None:
         """
         Sort entries based on language priority and alphabetically.
         """
-        # TODO
+        self._order = sorted((self._get_sort_key(lang_code), lang_code) for lang_code in self._entries)
+
+    @property
+    def entries(self) -> List[WiktionaryEntry]:
+        """
+        Entries in page order
+        """
+        return [self._entries[lang_code] for _, lang_code in self._order]
 
     def add_entry(self, entry: WiktionaryEntry) -> None:
         """
-        Add a new language entry to the page.
+        Add a new language entry to the page.  An existing entry for
+        the same language is replaced.
         """
-        # Remove entry with same language
-        self.entries = [cur for cur in self.entries if cur.lang_code != entry.lang_code]
-        self.entries.append(entry)
-        self._sort_entries()
+        if entry.lang_code not in self._entries:
+            insort(self._order, (self._get_sort_key(entry.lang_code), entry.lang_code))
+        self._entries[entry.lang_code] = entry
+
+    def remove_entry(self, lang_code: str) -> Optional[WiktionaryEntry]:
+        """
+        Remove a language entry from the page and return it.
+        """
+        entry = self._entries.pop(lang_code, None)
+        if entry is not None:
+            key = (self._get_sort_key(lang_code), lang_code)
+            del self._order[bisect_left(self._order, key)]
+        return entry
 
     def get_entries(self) -> List[WiktionaryEntry]:
         """
         Return entries
         """
-        return list(self.entries)
+        return self.entries
 
     def iter_entries(self) -> Iterator[WiktionaryEntry]:
         """
         Iterate over entries
         """
-        for entry in self.entries:
-            yield entry
+        for _, lang_code in self._order:
+            yield self._entries[lang_code]
 
     def get_entry(self, lang_code: str) -> Optional[WiktionaryEntry]:
         """
         Get a specific language entry.
         """
-        for entry in self.entries:
-            if entry.lang_code == lang_code:
-                return entry
-        return None
+        return self._entries.get(lang_code)
 
     def get_text(self) -> str:
         """
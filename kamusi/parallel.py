@@ -0,0 +1,91 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Functions to process data in parallel
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+
+
+def _apply_chunk(func, chunk):
+    """
+    Apply a function to all items of a chunk (run in a worker process)
+    """
+    return [func(item) for item in chunk]
+
+
+def _start_worker():
+    """
+    Do nothing (run in a worker process to start the workers)
+    """
+
+
+def start_pool(jobs=None):
+    """
+    Return a ProcessPoolExecutor for imap_ordered() whose worker
+    processes are already running, or None with jobs=1.  Call it before
+    starting any threads, so no worker is forked while another thread
+    holds a lock.  The caller has to shut the pool down.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs == 1:
+        return None
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    executor.submit(_start_worker).result()
+    return executor
+
+
+def imap_ordered(func, iterable, jobs=None, chunksize=16, window=None, executor=None):
+    """
+    Apply func to all items of iterable in worker processes and yield
+    the results in input order.
+
+    Items are sent to the workers in chunks of chunksize.  At most
+    window chunks are in flight at any time, so a huge or lazy input
+    is only consumed as fast as the results are used.
+
+    func and the items have to be picklable.  With jobs=1, everything
+    runs in the current process.  The workers of executor (see
+    start_pool()) are used if given; otherwise a pool is created.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if window is None:
+        window = jobs * 2
+    if executor is not None:
+        yield from _imap_chunks(executor, func, iterable, chunksize, window)
+    elif jobs == 1:
+        yield from map(func, iterable)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from _imap_chunks(executor, func, iterable, chunksize, window)
+
+
+def _imap_chunks(executor, func, iterable, chunksize, window):
+    """
+    Send chunks of items to the workers of executor and yield the
+    results in input order (see imap_ordered())
+    """
+    iterator = iter(iterable)
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < window:
+                chunk = list(islice(iterator, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_apply_chunk, func, chunk))
+            if not pending:
+                break
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,231 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Functions for an offline review queue
+
+A fixer is run over a local corpus and every change is written to a
+queue file (JSON Lines), which can be reviewed later.  Approved
+changes are then applied to the live pages, as long as the pages
+haven't changed since they were downloaded.
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import json
+
+import pywikibot
+
+import kamusi
+from kamusi.batch import apply_fixer
+
+PENDING = "pending"
+APPROVED = "approved"
+REJECTED = "rejected"
+APPLIED = "applied"
+STALE = "stale"
+FAILED = "failed"
+
+
+def read_queue(filename):
+    """
+    Read all records from a queue file
+    """
+    with open(filename, "r", encoding="utf-8") as queue_fp:
+        return [json.loads(line) for line in queue_fp if line.strip()]
+
+
+def write_queue(filename, records):
+    """
+    Write records to a queue file
+    """
+    with open(filename, "w", encoding="utf-8") as queue_fp:
+        for record in records:
+            print(json.dumps(record, ensure_ascii=False), file=queue_fp)
+
+
+def scan_corpus(
+    fixer,
+    directory,
+    lang,
+    changelog,
+    revids,
+    site="en",
+    minor=False,
+    pass_title=False,
+    jobs=None,
+):
+    """
+    Run a fixer over all entries of a local corpus and yield a record
+    for every entry that would change.  revids maps file names to
+    (title, revid) tuples, as returned by kamusi.read_revids(); it
+    provides the page titles, which can't be derived from the file
+    names.  Entries without a title are skipped.  The corpus is read
+    as fast as the records are consumed.
+    """
+    items = _with_titles(directory, revids)
+    func = partial(_scan_item, fixer, pass_title)
+    for name, title, old_text, new_text, new_changelog in kamusi.imap_ordered(
+        func, items, jobs=jobs
+    ):
+        if new_text is None or new_text == old_text:
+            continue
+        yield {
+            "title": title,
+            "site": site,
+            "lang": lang,
+            "revid": revids[name][1],
+            "old": old_text,
+            "new": new_text,
+            "changelog": new_changelog or changelog,
+            "minor": minor,
+            "status": PENDING,
+        }
+
+
+def _with_titles(directory, revids):
+    """
+    Yield (file name, title, entry) for all entries of a corpus with a
+    title in revids
+    """
+    for name, entry in kamusi.iter_corpus(directory):
+        if name not in revids:
+            print(f"No title for {name}, skipped")
+            continue
+        yield name, revids[name][0], entry
+
+
+def _scan_item(fixer, pass_title, item):
+    """
+    Return (file name, title, entry, new entry, changelog) for a
+    (file name, title, entry) tuple (run in a worker process)
+    """
+    name, title, entry = item
+    return (name, title, entry, *apply_fixer(fixer, pass_title, (title, entry)))
+
+
+def apply_fixers(fixers, pass_title, item):
+    """
+    Run several fixers on the same (title, entry) tuple.  Returns a
+    list with a (new entry, changelog) tuple for every fixer that
+    would change the entry and None for the others.
+    """
+    results = []
+    for fixer in fixers:
+        new_text, changelog = apply_fixer(fixer, pass_title, item)
+        if new_text is None or new_text == item[1]:
+            results.append(None)
+        else:
+            results.append((new_text, changelog))
+    return results
+
+
+def dry_run(fixers, directory, pass_title=False, jobs=None, revids=None):
+    """
+    Run fixers over all entries of a local corpus without changing
+    anything.  Every fixer sees the original entry.  Yields (title,
+    entry, results) for every entry that at least one fixer would
+    change, where results is the list returned by apply_fixers().
+    Titles are taken from revids (see scan_corpus()) and derived from
+    the file names otherwise.  The corpus is read as fast as the
+    results are consumed.
+    """
+    if revids is None:
+        revids = {}
+    items = (
+        (revids[name][0] if name in revids else kamusi.filename_to_title(name), entry)
+        for name, entry in kamusi.iter_corpus(directory)
+    )
+    func = partial(_dry_run_item, fixers, pass_title)
+    for result in kamusi.imap_ordered(func, items, jobs=jobs):
+        if result is not None:
+            yield result
+
+
+def _dry_run_item(fixers, pass_title, item):
+    """
+    Return (title, entry, results) if a fixer would change the entry
+    and None otherwise (run in a worker process)
+    """
+    results = apply_fixers(fixers, pass_title, item)
+    if not any(results):
+        return None
+    return item[0], item[1], results
+
+
+def review_queue(records):
+    """
+    Show the diff of every pending record and ask whether to approve
+    it.  Returns False if the review was stopped early.
+    """
+    pending = [record for record in records if record["status"] == PENDING]
+    for i, record in enumerate(pending, 1):
+        print(f"[{i}/{len(pending)}] {record['title']}")
+        print(kamusi.colour_diff(record["old"], record["new"]))
+        answer = input("Approve edit (Y/n/q): ").upper()
+        if answer == "Q":
+            return False
+        record["status"] = REJECTED if answer == "N" else APPROVED
+    return True
+
+
+def replace_entry(record, text):
+    """
+    Return the text of a page with the entry of a record replaced by
+    the new entry, or None if the entry has changed since the record
+    was created.  Entries are compared without trailing whitespace,
+    since the entries in a corpus end with a newline but the last
+    entry of a page doesn't.
+    """
+    entry = kamusi.get_entry(text, record["lang"], site=record["site"])
+    if entry is None or entry.rstrip() != record["old"].rstrip():
+        return None
+    start = text.index(entry)
+    end = start + len(entry.rstrip())
+    return text[:start] + record["new"].rstrip() + text[end:]
+
+
+def update_page(record, page):
+    """
+    Apply a record to a page and return the new status.  The edit is
+    only made if the page is still at the revision the record was
+    created from.
+    """
+    if page.latest_revision_id != record["revid"]:
+        print(f"Page changed since download, not saved: {record['title']}")
+        return STALE
+    text = replace_entry(record, page.text)
+    if text is None:
+        print(f"Entry changed since download, not saved: {record['title']}")
+        return STALE
+    page.text = text
+    page.save(record["changelog"], minor=record["minor"])
+    return APPLIED
+
+
+def apply_record(record):
+    """
+    Apply an approved record to the live page and return the new
+    status (see update_page())
+    """
+    site = pywikibot.Site(record["site"], "wiktionary")
+    page = pywikibot.Page(site, record["title"])
+    try:
+        return update_page(record, page)
+    except pywikibot.exceptions.Error as e:
+        print(f"Can't save {record['title']}: {e}")
+        return FAILED
+
+
+def apply_queue(records, max_workers=4):
+    """
+    Apply all approved records, with at most max_workers edits in
+    flight at the same time.  The status of every record is updated.
+    """
+    approved = [record for record in records if record["status"] == APPROVED]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for record, status in zip(approved, executor.map(apply_record, approved)):
+            record["status"] = status
@@ -0,0 +1,326 @@
+"""
+Functions for Swahili
+
+A morphology index is built from a corpus in a single scan.  It
+records the components of the affix templates of every entry and
+allows titles to be looked up by prefix and suffix.
+
+The audio files used by entries can be reconciled with the Swahili
+audio files available on Commons.
+"""
+
+from bisect import bisect_left
+from collections import namedtuple
+import re
+
+import mwparserfromhell
+import unidecode
+
+import kamusi
+
+# Templates listing the morphological components of a word
+AFFIX_TEMPLATES = ("af", "affix", "pre", "prefix", "suf", "suffix", "surf")
+
+# Noun class prefixes of titles and the letter with which the first
+# component of their affix templates has to start
+NOUN_CLASS_PREFIXES = {
+    "m": "m",
+    "ki": "k",
+    "u": "u",
+}
+
+RE_MODIFIER = re.compile(r"<[^<>]*>")
+RE_AUDIO = re.compile(r"\{\{\s*(audio|uttal)\s*\|([^{}]*)\}\}")
+RE_AFFIX = re.compile(r"\{\{\s*(?:" + "|".join(AFFIX_TEMPLATES) + r")\s*\|")
+
+# An affix template: its name and its components (without inline
+# modifiers)
+SwAffix = namedtuple("SwAffix", ["template", "components"])
+
+# The information about an entry kept in the index.  etymology lists
+# the words an entry is derived from according to its etymology.
+# is_borrowed is only set for borrowings from English with {{bor+}}.
+# missing_hyphen is set if an affix template has a prefix without
+# hyphen (see get_missing_hyphen()).
+SwEntry = namedtuple(
+    "SwEntry",
+    ["name", "affixes", "etymology", "is_alt_form", "is_borrowed", "missing_hyphen"],
+)
+
+
+def get_components(template, lang="sw"):
+    """
+    Return the components of an affix template or None if the
+    template is for another language
+    """
+    params = [str(param.value).strip() for param in template.params if not param.showkey]
+    if not params or params[0] != lang:
+        return None
+    components = [RE_MODIFIER.sub("", param).strip() for param in params[1:]]
+    return [component for component in components if component]
+
+
+def get_missing_hyphen(template, lang="sw"):
+    """
+    Return the parameter of an {{af}} or {{affix}} template for lang
+    whose prefix is missing a hyphen, or None.  The prefix is the first
+    component without inline modifiers; it's missing a hyphen if it has
+    one or two letters and doesn't end with "-".
+    """
+    if str(template.name).strip() not in ("af", "affix"):
+        return None
+    params = [param for param in template.params if not param.showkey]
+    if len(params) < 2 or str(params[0].value).strip() != lang:
+        return None
+    prefix = RE_MODIFIER.sub("", str(params[1].value)).strip()
+    if not prefix or prefix.endswith("-") or len(prefix) > 2:
+        return None
+    return params[1]
+
+
+def add_missing_hyphen(template, lang="sw"):
+    """
+    Add a hyphen to the prefix of an affix template if it's missing
+    (before any inline modifiers).  Returns True if the template was
+    changed.
+    """
+    param = get_missing_hyphen(template, lang)
+    if param is None:
+        return False
+    value = str(param.value).strip()
+    end = value.find("<") if "<" in value else len(value)
+    param.value = value[:end].rstrip() + "-" + value[end:]
+    return True
+
+
+def parse_entry(entry_name, entry):
+    """
+    Return an SwEntry() named tuple for an entry
+    """
+    affixes = []
+    etymology = []
+    is_alt_form = "{{alt form" in entry or "{{alternative form" in entry
+    is_borrowed = "{{bor+|sw|en|" in entry
+    missing_hyphen = False
+    for line in entry.splitlines():
+        if not RE_AFFIX.search(line) and "From {{m|" not in line:
+            continue
+        for template in mwparserfromhell.parse(line).filter_templates(recursive=False):
+            name = str(template.name).strip()
+            if get_missing_hyphen(template) is not None:
+                missing_hyphen = True
+            if name in AFFIX_TEMPLATES:
+                components = get_components(template)
+                if components is not None:
+                    affixes.append(SwAffix(name, components))
+                    etymology.extend(components)
+            elif name == "m" and line.startswith("From "):
+                components = get_components(template)
+                if components:
+                    etymology.append(components[0])
+    return SwEntry(entry_name, affixes, etymology, is_alt_form, is_borrowed, missing_hyphen)
+
+
+def _parse_item(item):
+    """
+    Parse a (name, entry) tuple from a corpus
+    """
+    return parse_entry(*item)
+
+
+class MorphologyIndex:
+    """
+    An index of the entries of a corpus with lookups of titles by
+    prefix, suffix and affix component
+    """
+
+    def __init__(self, entries):
+        self.entries = {entry.name: entry for entry in entries}
+        self.titles = sorted(self.entries)
+        self.reversed_titles = sorted(title[::-1] for title in self.titles)
+        self.components = {}
+        for entry in self.entries.values():
+            for component in sorted({c for affix in entry.affixes for c in affix.components}):
+                self.components.setdefault(component, []).append(entry.name)
+
+    @classmethod
+    def from_corpus(cls, directory, jobs=None):
+        """
+        Build the index from a directory with one file per entry
+        """
+        return cls(kamusi.imap_ordered(_parse_item, kamusi.iter_corpus(directory), jobs=jobs))
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_entry(self, name):
+        """
+        Return the SwEntry() for a title or None
+        """
+        return self.entries.get(name)
+
+    @staticmethod
+    def _starting_with(titles, prefix):
+        """
+        Yield the titles of a sorted list that start with prefix
+        """
+        for title in titles[bisect_left(titles, prefix) :]:
+            if not title.startswith(prefix):
+                break
+            yield title
+
+    def with_prefix(self, prefix):
+        """
+        Return the titles starting with prefix in sorted order
+        """
+        return list(self._starting_with(self.titles, prefix))
+
+    def with_suffix(self, suffix):
+        """
+        Return the titles ending with suffix in sorted order
+        """
+        return sorted(
+            title[::-1] for title in self._starting_with(self.reversed_titles, suffix[::-1])
+        )
+
+    def with_component(self, component):
+        """
+        Return the titles that have component in an affix template
+        """
+        return self.components.get(component, [])
+
+
+def find_wrong_prefixes(index, prefixes=None):
+    """
+    Yield (title, affix) tuples for affix templates whose first
+    component doesn't match the noun class prefix of the title
+    """
+    if prefixes is None:
+        prefixes = NOUN_CLASS_PREFIXES
+    for prefix, start in prefixes.items():
+        for title in index.with_prefix(prefix):
+            for affix in index.get_entry(title).affixes:
+                if affix.template not in ("af", "affix", "pre", "prefix"):
+                    continue
+                if affix.components and not affix.components[0].startswith(start):
+                    yield title, affix
+
+
+def find_missing_hyphens(index):
+    """
+    Yield the titles with an affix template whose prefix is missing a
+    hyphen (see get_missing_hyphen())
+    """
+    for title in index.titles:
+        if index.get_entry(title).missing_hyphen:
+            yield title
+
+
+def find_derived_from(index, suffix, source_suffix, ignore=()):
+    """
+    Yield the titles ending with suffix whose etymology doesn't
+    mention a word ending with source_suffix (e.g. nouns in -ano that
+    might be derived from a reciprocal verb in -ana).  Alternative
+    forms, borrowings and titles with spaces are skipped.
+    """
+    for title in index.with_suffix(suffix):
+        if title in ignore or " " in title:
+            continue
+        entry = index.get_entry(title)
+        if entry.is_alt_form or entry.is_borrowed:
+            continue
+        if any(word.endswith(source_suffix) for word in entry.etymology):
+            continue
+        yield title
+
+
+def parse_audio(audio):
+    """
+    Extract the entry name from an audio file
+    """
+    audio = audio.replace(".flac", "")
+    audio = audio.replace(".oga", "")
+    audio = audio.strip("-")
+    audio = unidecode.unidecode(audio)  # strip stress markers (e.g. mújibu)
+    if audio.startswith("Sw-ke-"):
+        audio = audio.removeprefix("Sw-ke-")
+        audio = audio.replace("_", " ")
+        return audio
+    if audio.startswith("Sw-"):
+        audio = audio.removeprefix("Sw-")
+        return audio
+    print("Don't know how to handle:", audio)
+    return audio
+
+
+def get_audio_key(name):
+    """
+    Return the form in which entry names and the names parsed from
+    audio files are compared
+    """
+    return name.strip("-").lower()
+
+
+def get_audio_files(entry):
+    """
+    Return the audio files used in {{audio}} (English Wiktionary) and
+    {{uttal}} (Swedish Wiktionary) templates of an entry
+    """
+    files = []
+    for name, params in RE_AUDIO.findall(entry):
+        params = [param.strip() for param in params.split("|")]
+        if name == "audio":
+            positional = [param for param in params if "=" not in param]
+            if len(positional) >= 2:
+                files.append(positional[1])
+        else:
+            files.extend(
+                param.removeprefix("ljud=").strip()
+                for param in params
+                if param.startswith("ljud=")
+            )
+    return [audio for audio in files if audio]
+
+
+# The result of reconcile_audio(): (entry name, audio file) tuples for
+# audio files that don't match the entry, (entry name, audio files)
+# tuples for entries without audio for which files are available and
+# the files that don't belong to any entry
+AudioReport = namedtuple("AudioReport", ["mismatched", "missing", "orphans"])
+
+
+def reconcile_audio(entries, files):
+    """
+    Compare the audio files used by entries, given as (name, entry)
+    tuples, with the available audio files in one pass and return an
+    AudioReport
+    """
+    available = {}
+    for audio in sorted(kamusi.normalize_file_title(audio) for audio in files):
+        available.setdefault(get_audio_key(parse_audio(audio)), []).append(audio)
+    names = set()
+    used = set()
+    mismatched = []
+    missing = []
+    for entry_name, entry in entries:
+        key = get_audio_key(entry_name)
+        names.add(key)
+        audio_files = get_audio_files(entry)
+        for audio in audio_files:
+            audio = kamusi.normalize_file_title(audio)
+            used.add(audio)
+            if get_audio_key(parse_audio(audio)) != key:
+                mismatched.append((entry_name, audio))
+        if not audio_files and key in available:
+            missing.append((entry_name, available[key]))
+    orphans = [
+        audio
+        for key, audio_files in sorted(available.items())
+        if key not in names
+        for audio in audio_files
+        if audio not in used
+    ]
+    return AudioReport(mismatched, missing, orphans)
@@ -4,7 +4,7 @@ import kamusi
 import unittest
 import pathlib
 
-from kamusi.page import WiktionaryPage
+from kamusi.page import EnglishWiktionaryEntry, WiktionaryEntry, WiktionaryPage
 
 @dataclass
 class WikicodeTestData:
@@ -63,6 +63,50 @@ class TestAlso(KamusiTestCase):
 
         self.run_test("en_remove", remove_also)
 
+
+class TestEntryOrder(unittest.TestCase):
+    TEXT = "==Swahili==\n===Verb===\n\n==English==\n===Noun===\n\n==Afrikaans==\n===Noun===\n"
+
+    def get_page(self):
+        return kamusi.page.WiktionaryPage.with_language_edition(
+            title="test", site_lang="en", from_text=self.TEXT
+        )
+
+    def test_parse_order(self):
+        page = self.get_page()
+        self.assertEqual([entry.lang_code for entry in page.entries], ["en", "af", "sw"])
+
+    def test_add_remove(self):
+        page = self.get_page()
+        page.add_entry(EnglishWiktionaryEntry("mul", "==Translingual==\n"))
+        page.add_entry(EnglishWiktionaryEntry("de", "==German==\n"))
+        self.assertEqual([entry.lang_code for entry in page.entries], ["mul", "en", "af", "de", "sw"])
+        page.add_entry(EnglishWiktionaryEntry("de", "==German==\n===Noun===\n"))
+        self.assertEqual(len(page.entries), 5)
+        self.assertIn("Noun", str(page.get_entry("de")))
+        self.assertIsNotNone(page.remove_entry("af"))
+        self.assertIsNone(page.get_entry("af"))
+        self.assertEqual([entry.lang_code for entry in page.iter_entries()], ["mul", "en", "de", "sw"])
+
+
+class TestFromTexts(unittest.TestCase):
+    TEXT = "{{also|Hima}}\n==English==\n===Noun===\n{{en-noun}}\n\n==Swahili==\n===Verb===\n{{sw-verb}}\n"
+
+    def test_pages(self):
+        pages = list(WiktionaryPage.from_texts([("hima", self.TEXT)] * 3, "en", jobs=2))
+        self.assertEqual(len(pages), 3)
+        page = pages[0]
+        self.assertEqual(page.title, "hima")
+        self.assertEqual(page.also, ("Hima",))
+        self.assertEqual([entry.lang_code for entry in page.entries], ["en", "sw"])
+        self.assertEqual(page.get_entry("sw").headings, ((3, "Verb"),))
+
+    def test_entries(self):
+        texts = ["==English==\n===Noun===\n", "==Swahili==\n===Verb===\n"]
+        entries = list(WiktionaryEntry.from_texts(texts, jobs=1))
+        self.assertEqual([entry.lang_name for entry in entries], ["English", "Swahili"])
+        self.assertEqual([str(entry.text) for entry in entries], texts)
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,351 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Functions to work with translation tables
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from collections import namedtuple
+import re
+
+import mwparserfromhell
+
+from .lang import code_to_name
+
+TRANS_TOP = ("{{trans-top", "{{checktrans-top")
+TRANS_BOTTOM = "{{trans-bottom"
+# Templates that may appear on their own line inside a table
+TRANS_INNER = ("{{trans-mid", "{{multitrans")
+
+RE_TRANS = re.compile(r"\*+:*\s*(?P<lang>[^:{]+)[:：]\s*(?P<def>[^\s].*)?")
+RE_TRANS_LANG = re.compile(r"(?P<start>\*:*)\s*(?P<lang>[^:]+)[:：]\s*(?P<def>[^\s].*)?")
+RE_TRANS_LINE = re.compile(r"(?P<depth>\*[*:]*)\s*(?P<lang>[^:{]+)[:：]")
+RE_TRANS_ITEM = re.compile(r"\{\{(?P<name>t\+?|tt\+?|t-check|t\+check)\|(?P<params>[^{}]*)\}\}")
+
+# Common misspellings of language names in translations
+LANG_NAME_FIXES = {
+    "Albania": "Albanian",
+    "Albanina": "Albanian",
+    "Albanisn": "Albanian",
+    "Allemanic German": "Alemannic German",
+    "Arabjc": "Arabic",
+    "Arab": "Arabic",
+    "Arabian": "Arabic",
+    "Assyrian Neo Aramaic": "Assyrian Neo-Aramaic",
+    "Belarussian": "Belarusian",
+    "Catalam": "Catalan",
+    "Croatian": "Serbo-Croatian",
+    "Finnis": "Finnish",
+    "Français": "French",
+    "Gernam": "German",
+    "Gernan": "German",
+    "GReek": "Greek",
+    "Ηebrew": "Hebrew",
+    "Italia": "Italian",
+    "Itaian": "Italian",
+    "Italiano": "Italian",
+    "Norsk": "Nynorsk",
+    "Nynorsh": "Nynorsk",
+    "Nynorskl": "Nynorsk",
+    "Norweigan": "Norwegian",
+    "Northern Sámi": "Northern Sami",
+    "Japaneae": "Japanese",
+    "Papantle Totonec": "Papantla Totonac",
+    "Plauttdietsch": "Plautdietsch",
+    "Poliah": "Polish",
+    "Pollish": "Polish",
+    "Portugal": "Portuguese",
+    "Portugese": "Portuguese",
+    "Portguese": "Portuguese",
+    "Portughese": "Portuguese",
+    "Portuugese": "Portuguese",
+    "Romaniann": "Romanian",
+    "Rumanian": "Romanian",
+    "Russia": "Russian",
+    "Russsian": "Russian",
+    "Romansh": "Romansch",
+    "Rumansch": "Romansch",
+    "Sinhala": "Sinhalese",
+    "Sweidsh": "Swedish",
+    "Tagaloh": "Tagalog",
+    "Turkis": "Turkish",
+    "Vietnam": "Vietnamese",
+    "Vietnamee": "Vietnamese",
+    "Waray Waray": "Waray-Waray",
+    "Waray-waray": "Waray-Waray",
+    "We;sh": "Welsh",
+}
+
+
+def ends_table(line):
+    """
+    Check if a line ends a translation table that is missing
+    {{trans-bottom}}: an empty line, a header, a new table or a
+    template other than {{trans-mid}} and {{multitrans}}
+    """
+    return (
+        not line.strip()
+        or line.startswith("=")
+        or (line.startswith("{{") and not line.startswith(TRANS_INNER))
+    )
+
+
+def get_gloss(line):
+    """
+    Return the gloss of a {{trans-top}} line (its first positional
+    parameter)
+    """
+    templates = mwparserfromhell.parse(line).filter_templates(recursive=False)
+    if not templates:
+        return ""
+    params = [param for param in templates[0].params if not param.showkey]
+    return str(params[0].value).strip() if params else ""
+
+
+def add_trans_bottom_line(line, previous):
+    """
+    Add missing trans-bottom before a line that ends the table
+    """
+    if ends_table(line):
+        return "{{trans-bottom}}\n" + line
+    return line
+
+
+def remove_empty_line(line, previous):
+    """
+    Remove empty lines in translation
+    """
+    if not line.strip():
+        return ""
+    return line
+
+
+def fix_syntax_line(line, previous):
+    """
+    Fix syntax errors in translations
+    """
+    match = RE_TRANS.search(line)
+    if not match:
+        # Add missing *
+        if match := re.match(r"#?\s*([A-Z][^{]+)\s*(\{\{t.+)", line):
+            delim = "*"
+            if "Chinese" in previous or "Geek" in previous or "Norwegian" in previous:
+                delim = "*:"
+            line = delim + " " + match.group(1).rstrip('":; ') + ": " + match.group(2) + "\n"
+        elif line.startswith("Greek") or line.startswith("Norwegian:"):
+            line = "* " + line
+        # Add missing language
+        elif match := re.match(r"(\*:*)?\s*(\{\{(t|no equivalent translation).*)", line):
+            lang = re.search(r"\{\{[^|]+\|([^|}]+)", match.group(2))
+            lang = code_to_name(lang.group(1))
+            delim = match.group(1) or "*"
+            # FIXME: why
+            if lang not in previous:
+                line = delim + " " + lang + ": " + match.group(2) + "\n"
+        # Add missing colon
+        elif match := re.match(r"(\*:*\s*[^:{]+)\s*(\{\{t.+)", line):
+            line = match.group(1).rstrip('"; ') + ": " + match.group(2) + "\n"
+    # Remove double colon
+    return re.sub(r"([a-z]):\s*:\s*\{\{", r"\1: {{", line)
+
+
+def fix_lang_name_line(line, previous):
+    """
+    Fix language names in translations
+    """
+    match = RE_TRANS_LANG.search(line)
+    if not match:
+        return line
+    lang = match.group("lang")
+    if lang not in LANG_NAME_FIXES:
+        return line
+    line = match.group("start") + " " + LANG_NAME_FIXES[lang] + ":"
+    if match.group("def"):
+        line += " " + match.group("def")
+    return line + "\n"
+
+
+def fix_separation_line(line, previous):
+    """
+    Fix separation of translations
+    """
+    return re.sub(r"\}\}\. +", "}}, ", line)
+
+
+def add_whitespace_line(line, previous):
+    """
+    Add space between translations
+    """
+    return re.sub(r"\}\},\{\{+", "}}, {{", line)
+
+
+def fix_cosmetic_line(line, previous):
+    """
+    Fix cosmetic issues in translations
+    """
+    if RE_TRANS.search(line):
+        line = line.replace("}},{{", "}}, {{")
+        line = re.sub(r"([a-z])\s*:\s*\{\{", r"\1: {{", line)
+    return line
+
+
+TransRule = namedtuple("TransRule", ["name", "func", "description", "minor"])
+
+# All rules in the order in which they are run
+TRANSLATION_RULES = {
+    rule.name: rule
+    for rule in (
+        TransRule("empty-lines", remove_empty_line, "Remove empty lines in translation", True),
+        TransRule("syntax", fix_syntax_line, "Fix syntax error", False),
+        TransRule("language", fix_lang_name_line, "Fix language name", False),
+        TransRule("separation", fix_separation_line, "Fix separation of translations", False),
+        TransRule("whitespace", add_whitespace_line, "Add space between translations", True),
+        TransRule("cosmetic", fix_cosmetic_line, "Fix cosmetic issues", True),
+        TransRule("trans-bottom", add_trans_bottom_line, "Add missing trans-bottom", False),
+    )
+}
+
+
+def _closes_table(lines, start):
+    """
+    Check if the table ends at the next line that isn't empty
+    """
+    for line in lines[start:]:
+        if line.strip():
+            return ends_table(line)
+    return True
+
+
+def fix_translations(entry, rules=None):
+    """
+    Run line rules over all translation tables of an entry in a single
+    pass.  Returns the new entry and the names of the rules that
+    changed something.
+
+    Every line of a table is passed through the rules in order.  A
+    rule can drop a line by returning an empty string or close the
+    table by adding {{trans-bottom}}.  A line that still ends the
+    table after the rules (see ends_table()) ends it, so tables have
+    the same boundaries as in parse_translations() once the rules
+    have fixed the lines.  An empty line before the end of a table is
+    never removed, so {{trans-bottom}} is added before it.
+    """
+    if rules is None:
+        rules = TRANSLATION_RULES.values()
+    applied = []
+    result = []
+    in_trans = False
+    previous = ""
+    lines = entry.splitlines(keepends=True)
+    for i, line in enumerate(lines):
+        if line.startswith(TRANS_TOP):
+            in_trans = True
+        elif line.startswith(TRANS_BOTTOM):
+            in_trans = False
+        elif in_trans:
+            line_rules = rules
+            if not line.strip() and _closes_table(lines, i + 1):
+                line_rules = [rule for rule in rules if rule.name != "empty-lines"]
+            for rule in line_rules:
+                new_line = rule.func(line, previous)
+                if new_line != line:
+                    if rule.name not in applied:
+                        applied.append(rule.name)
+                    line = new_line
+                if not line:
+                    break
+                if TRANS_BOTTOM in line:
+                    in_trans = False
+                    break
+            if line and ends_table(line):
+                in_trans = False
+        result.append(line)
+        if line:
+            previous = line
+    return "".join(result), applied
+
+
+def translations_changelog(applied):
+    """
+    Return a changelog for the translation rules that were applied
+    """
+    return "/* Translations */ " + "; ".join(
+        rule.description for rule in TRANSLATION_RULES.values() if rule.name in applied
+    )
+
+
+TransTable = namedtuple("TransTable", ["gloss", "start", "end", "closed", "lines"])
+TransLine = namedtuple("TransLine", ["start", "end", "depth", "lang", "items"])
+TransItem = namedtuple("TransItem", ["start", "end", "template", "lang_code", "term"])
+
+
+def parse_trans_line(line, offset=0):
+    """
+    Parse a line of a translation table into a TransLine.  Offsets are
+    relative to the text the line was taken from.
+    """
+    match = RE_TRANS_LINE.match(line)
+    depth = len(match.group("depth")) if match else 0
+    lang = match.group("lang").strip() if match else None
+    items = []
+    for item in RE_TRANS_ITEM.finditer(line):
+        params = [p for p in item.group("params").split("|") if "=" not in p]
+        items.append(
+            TransItem(
+                offset + item.start(),
+                offset + item.end(),
+                item.group("name"),
+                params[0] if params else None,
+                params[1] if len(params) > 1 else None,
+            )
+        )
+    return TransLine(offset, offset + len(line), depth, lang, items)
+
+
+def parse_translations(text):
+    """
+    Parse all translation tables in a text in a single, linear pass.
+
+    A table starts with {{trans-top}} or {{checktrans-top}} and ends
+    with {{trans-bottom}}.  If {{trans-bottom}} is missing, the table
+    ends (with closed set to False) before the next line for which
+    ends_table() is true.  Offsets are character offsets into the text, so
+    they can be used to edit the text with apply_edits().
+    """
+    table = None
+    lines = []
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        if table is not None:
+            if line.startswith(TRANS_BOTTOM):
+                yield table._replace(end=pos + len(line), closed=True, lines=lines)
+                table = None
+            elif ends_table(line):
+                yield table._replace(end=pos, lines=lines)
+                table = None
+            else:
+                lines.append(parse_trans_line(line, pos))
+        if table is None and line.startswith(TRANS_TOP):
+            table = TransTable(get_gloss(line), pos, None, False, None)
+            lines = []
+        pos += len(line)
+    if table is not None:
+        yield table._replace(end=pos, lines=lines)
+
+
+def apply_edits(text, edits):
+    """
+    Replace parts of a text.  edits is an iterable of (start, end,
+    replacement) tuples which must not overlap.
+    """
+    result = []
+    pos = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[0]):
+        result.append(text[pos:start])
+        result.append(replacement)
+        pos = end
+    result.append(text[pos:])
+    return "".join(result)
@@ -0,0 +1,168 @@
+"""
+Compare Yiddish words from several sources (ISOF, Swedish and English
+Wiktionary)
+
+Every source provides YiddishFoo() named tuples.  The words of all
+sources for a page are grouped by part of speech and the senses of
+every part of speech are matched up before their fields are compared.
+"""
+
+import hashlib
+from itertools import permutations
+from pathlib import Path
+
+import isofyi
+import kamusi
+
+# The fields that are compared for every part of speech
+POS_FIELDS = {
+    isofyi.YiddishNoun: ("gender", "plural"),
+    isofyi.YiddishVerb: ("past_participle",),
+}
+
+# Labels used in the output
+FIELD_LABELS = {
+    "gender": "gender",
+    "plural": "plural",
+    "past_participle": "past participle",
+}
+
+# A source without the sense
+MISSING = object()
+
+# Senses are matched by trying all assignments up to this number of
+# senses and greedily beyond
+MAX_PERMUTATIONS = 6
+
+
+def normalize(value):
+    """
+    Return a field value as a string (or None), so values parsed from
+    wikitext compare equal to plain strings
+    """
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
+def group_by_pos(words):
+    """
+    Group words by their part of speech (the named tuple class)
+    """
+    groups = {}
+    for word in words:
+        if word:
+            groups.setdefault(type(word), []).append(word)
+    return groups
+
+
+def count_differences(a, b, fields):
+    """
+    Count the fields in which two senses differ
+    """
+    return sum(
+        normalize(getattr(a, field)) != normalize(getattr(b, field)) for field in fields
+    )
+
+
+def match_senses(anchor, senses, fields):
+    """
+    Match senses to the anchor senses so that as few fields as
+    possible differ.  Returns a list with the sense matched to every
+    anchor sense, or MISSING.
+    """
+    if len(anchor) == 1 and len(senses) == 1:
+        return list(senses)
+    result = [MISSING] * len(anchor)
+    if max(len(anchor), len(senses)) <= MAX_PERMUTATIONS:
+        if len(senses) <= len(anchor):
+            best = min(
+                permutations(range(len(anchor)), len(senses)),
+                key=lambda perm: sum(
+                    count_differences(anchor[i], sense, fields)
+                    for i, sense in zip(perm, senses)
+                ),
+            )
+            for i, sense in zip(best, senses):
+                result[i] = sense
+        else:
+            best = min(
+                permutations(range(len(senses)), len(anchor)),
+                key=lambda perm: sum(
+                    count_differences(sense, senses[j], fields)
+                    for sense, j in zip(anchor, perm)
+                ),
+            )
+            result = [senses[j] for j in best]
+        return result
+    pairs = sorted(
+        (count_differences(a, b, fields), i, j)
+        for i, a in enumerate(anchor)
+        for j, b in enumerate(senses)
+    )
+    used = set()
+    for _, i, j in pairs:
+        if result[i] is MISSING and j not in used:
+            result[i] = senses[j]
+            used.add(j)
+    return result
+
+
+def compare_senses(word, sources, fields):
+    """
+    Compare the senses of one word and part of speech from several
+    sources.  Yields (field, word, value1, value2, ...) tuples for every
+    field on which the sources disagree.  The value is None for
+    sources without the sense.
+    """
+    present = [senses for senses in sources if senses]
+    if len(present) < 2:
+        return
+    anchor = present[0]
+    matched = []
+    for senses in sources:
+        if senses is anchor:
+            matched.append(anchor)
+        elif senses:
+            matched.append(match_senses(anchor, senses, fields))
+        else:
+            matched.append([MISSING] * len(anchor))
+    for i in range(len(anchor)):
+        for field in fields:
+            values = [
+                MISSING if senses[i] is MISSING else normalize(getattr(senses[i], field))
+                for senses in matched
+            ]
+            if len({value for value in values if value is not MISSING}) > 1:
+                yield (FIELD_LABELS.get(field, field), word) + tuple(
+                    None if value is MISSING else value for value in values
+                )
+
+
+def compare_words(word, sources, fields=None):
+    """
+    Compare the words from several sources for one page.  sources is a
+    list with an iterable of YiddishFoo() named tuples for every
+    source.  fields maps parts of speech to the fields to compare
+    (default: POS_FIELDS).
+    """
+    if fields is None:
+        fields = POS_FIELDS
+    groups = [group_by_pos(words) for words in sources]
+    for pos, pos_fields in fields.items():
+        yield from compare_senses(word, [group.get(pos, []) for group in groups], pos_fields)
+
+
+def load_dictionary(json_file, cache_dir=None):
+    """
+    Load the ISOF dictionary from the JSON file.
+
+    The parsed dictionary is stored in the cache directory and used
+    as long as the JSON file and isofyi.PARSER_VERSION don't change.
+    """
+    json_file = Path(json_file).resolve()
+    stat = json_file.stat()
+    key = (isofyi.PARSER_VERSION, str(json_file), stat.st_mtime_ns, stat.st_size)
+    name = hashlib.sha1(str(json_file).encode("utf-8")).hexdigest()
+    cache_file = Path(cache_dir or kamusi.get_cache_dir("isofyi")) / f"{name}.pickle"
+    return kamusi.load_cached(cache_file, key, lambda: isofyi.IsofDictionary.from_file(json_file))
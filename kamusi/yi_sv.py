@@ -2,12 +2,20 @@
 Functions for Yiddish for Swedish Wiktionary
 """
 
+from collections import namedtuple
 import re
 
 import mwparserfromhell
 
 import isofyi
 
+RE_HEADER = re.compile(r"(=+)\s*(?P<title>.*?)\s*\1\s*$")
+RE_TEMPLATE_NAME = re.compile(r"\{\{\s*([^|{}]*[^|{}\s])")
+
+# A part (definition) of an entry: the title of its section, the names
+# of the templates before the definitions and the lines they're on
+SvPart = namedtuple("SvPart", ["pos", "templates", "text"])
+
 
 def get_section(entry, title):
     """
@@ -58,8 +66,21 @@ def get_gender(templates):
     """
     Get the gender from templates
     """
+    return get_gender_from_names(str(template.name) for template in templates)
+
+
+def get_template_names(text):
+    """
+    Get the names of all templates in a text
+    """
+    return RE_TEMPLATE_NAME.findall(text)
+
+
+def get_gender_from_names(template_names):
+    """
+    Get the gender from template names
+    """
     genders = []
-    template_names = [str(template.name) for template in templates]
     for name in template_names:
         if name in ("subst", "länk"):
             continue
@@ -101,13 +122,157 @@ def get_verb(entry_name, entry):
     return None
 
 
+def iter_parts(entry):
+    """
+    Yield an SvPart for every part (definition) of an entry in a
+    single scan over its lines.  A part consists of template lines
+    followed by the line with the headword (starting with ''').
+    """
+    pos = None
+    lines = []
+    for line in entry.splitlines(keepends=True):
+        if line.startswith("="):
+            match = RE_HEADER.match(line)
+            pos = match.group("title") if match else None
+            lines = []
+        elif pos is None:
+            continue
+        elif line.startswith("{{") and line.rstrip().endswith("}}"):
+            lines.append(line)
+        elif line.startswith("'''") and lines:
+            lines.append(line)
+            text = "".join(lines)
+            yield SvPart(pos, get_template_names(text), text)
+            lines = []
+        elif not line.strip():
+            # Sections end with an empty line
+            pos = None
+            lines = []
+        else:
+            lines = []
+
+
 def parse_entry(entry_name, entry):
     """
     Return a YiddishFoo() named tuple for an entry from Swedish Wiktionary
     """
-    if "===Substantiv===" in entry:
-        for part in get_parts(get_noun_section(entry)):
-            yield get_noun(entry_name, part)
-    if "===Verb===" in entry:
-        for part in get_parts(get_verb_section(entry)):
-            yield get_verb(entry_name, part)
+    for part in iter_parts(entry):
+        if part.pos == "Substantiv":
+            gender = get_gender_from_names(part.templates)
+            yield isofyi.YiddishNoun(entry_name, gender, None)
+        elif part.pos == "Verb":
+            yield get_verb(entry_name, part.text)
+
+
+# Final letters, which change when a suffix is added
+FINALS = ["ך", "ם", "ן", "ף", "ץ"]
+
+# Plural suffixes supported by {{yi-subst-X-Y}} (the plural endings
+# isofyi.get_plural() maps ISOF's plurals to)
+PLURAL_SUFFIXES = ("en", "er", "es", "n", "s", "im", "ech")
+
+
+def gen_gender_str(gender):
+    """
+    Generate a string containing gender templates
+    """
+    # There's {{mf}} but no {{mn}} and {{fn}}
+    if gender in ("mn", "fn"):
+        return gen_gender_str(gender[0]) + " ''eller'' " + gen_gender_str(gender[1])
+    return "{{" + gender + "}}"
+
+
+def add_noun_gender(entry, gender):
+    """
+    Add gender to noun
+    """
+    subst = [name for name in get_template_names(entry) if name.startswith("yi-subst-")]
+    if subst:
+        subst_gender = get_gender_from_names(subst)
+        if get_gender_from_names([gender]) != subst_gender:
+            raise ValueError(f"Gender {gender} doesn't match {', '.join(subst)}")
+    result = []
+    in_noun = False
+    for line in entry.splitlines(keepends=True):
+        if "===Substantiv===" in line:
+            in_noun = True
+        elif line.startswith("==="):
+            in_noun = False
+        elif in_noun and line.startswith("'''"):
+            if ") {{" in line:
+                raise ValueError("Page already has gender")
+            if not line.endswith(")\n"):
+                raise ValueError("Don't know how to process line: " + line.rstrip())
+            line = line.rstrip() + " " + gen_gender_str(gender) + "\n"
+        result.append(line)
+    return "".join(result)
+
+
+def add_noun_plural(entry_name, entry, gender, plural):
+    """
+    Add plural to noun
+    """
+    if entry_name[-1] in FINALS:
+        raise NotImplementedError("Page ends in letter that changes - currently unsupported")
+    if plural not in PLURAL_SUFFIXES:
+        raise ValueError(f"Unsupported plural: {plural}")
+    if "{{yi-subst-" in entry:
+        raise ValueError("Page already has plural info")
+    result = []
+    for line in entry.splitlines(keepends=True):
+        if line == "{{subst|yi}}\n":
+            line = "{{yi-subst-" + gender + "-" + plural + "}}\n"
+        result.append(line)
+    return "".join(result)
+
+
+def read_noun_changes(rows):
+    """
+    Collect the gender and plural changes per page from mismatch rows
+    (field, word, English Wiktionary value, ISOF value) as written by
+    identify_mismatch.  The ISOF value is used and empty values are
+    skipped.  Raises ValueError for rows with other columns (e.g. from
+    compare_sources).
+    """
+    changes = {}
+    for row in rows:
+        if len(row) != 4:
+            raise ValueError(f"Not a row from identify_mismatch: {row}")
+        field, word, _, new = row
+        if field not in ("gender", "plural"):
+            continue
+        if new:
+            changes.setdefault(word, {})[field] = new
+    return changes
+
+
+def apply_noun_changes(entry_name, entry, change):
+    """
+    Add the gender and plural of a change to a noun.  Returns a
+    (new entry, descriptions) tuple, where descriptions lists what
+    was actually added.  The gender for the plural template is taken
+    from the entry if the change has none.
+    """
+    descriptions = []
+    gender = change.get("gender")
+    if gender:
+        new_entry = add_noun_gender(entry, gender)
+        if new_entry != entry:
+            entry = new_entry
+            descriptions.append("gender")
+    plural = change.get("plural")
+    if plural:
+        if not gender:
+            genders = [
+                word.gender
+                for word in parse_entry(entry_name, entry)
+                if isinstance(word, isofyi.YiddishNoun) and word.gender
+            ]
+            if len(set(genders)) != 1:
+                raise ValueError("Can't determine gender for plural")
+            gender = genders[0]
+        new_entry = add_noun_plural(entry_name, entry, gender, plural)
+        if new_entry != entry:
+            entry = new_entry
+            descriptions.append("plural")
+    return entry, descriptions
@@ -0,0 +1,72 @@
+# Copyright (C) 2026  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test functions for storing edits in the background
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+import pywikibot
+
+from kamusi.batch import Change, SaveWorker
+
+
+class FakePage:
+    """
+    A page whose save() raises the given exception
+    """
+
+    def __init__(self, title, text, error=None):
+        self._title = title
+        self.text = text
+        self.error = error
+        self.saved = False
+
+    def title(self):
+        """
+        Return the title of the page
+        """
+        return self._title
+
+    def save(self, summary, minor=False):
+        """
+        Store the page or raise the exception
+        """
+        if self.error is not None:
+            raise self.error
+        self.saved = True
+
+
+def save_all(changes, rebase=None):
+    """
+    Store the changes and return the titles that weren't saved
+    """
+    saver = SaveWorker("Fix", rebase=rebase)
+    saver.start()
+    for change in changes:
+        saver.submit(change)
+    saver.close()
+    return saver.failed
+
+
+def test_unexpected_error():
+    """
+    Test that an unexpected exception doesn't stop the worker
+    """
+    broken = FakePage("a", "old", RuntimeError("broken"))
+    page = FakePage("b", "old")
+    failed = save_all([Change(broken, "old", "new", None), Change(page, "old", "new", None)])
+    assert failed == ["a"]
+    assert page.saved
+    assert page.text == "new"
+
+
+def test_edit_conflict_without_rebase():
+    """
+    Test that an edit conflict fails without rebase
+    """
+    page = FakePage("a", "old")
+    page.error = pywikibot.exceptions.EditConflictError(page)
+    assert save_all([Change(page, "old", "new", None)]) == ["a"]
@@ -0,0 +1,32 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test caching functions
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from kamusi import load_cached
+
+
+def test_load_cached(tmp_path):
+    """
+    Test that objects are built once per key
+    """
+    calls = []
+
+    def build():
+        calls.append(None)
+        return {"a": len(calls)}
+
+    cache_file = tmp_path / "cache" / "test.pickle"
+    assert load_cached(cache_file, 1, build) == {"a": 1}
+    assert load_cached(cache_file, 1, build) == {"a": 1}
+    assert len(calls) == 1
+    assert load_cached(cache_file, 2, build) == {"a": 2}
+    assert not list(cache_file.parent.glob("*.tmp"))
+    # A corrupt cache file is rebuilt
+    cache_file.write_bytes(b"garbage")
+    assert load_cached(cache_file, 2, build) == {"a": 3}
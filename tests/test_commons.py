@@ -0,0 +1,115 @@
+# Copyright (C) 2026  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test Commons functions
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+import gzip
+
+from kamusi.commons import CommonsResolver, normalize_file_title, read_file_list
+
+
+class FakeResponse:
+    """
+    A response of the Commons API
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        """
+        The request was successful
+        """
+
+    def json(self):
+        """
+        Return the data of the response
+        """
+        return self.data
+
+
+class FakeSession:
+    """
+    Answer API queries from a set of existing files and record the
+    queries
+    """
+
+    def __init__(self, files):
+        self.files = files
+        self.queries = []
+
+    def get(self, url, params, timeout):  # pylint: disable=unused-argument
+        """
+        Answer an API query
+        """
+        titles = params["titles"].split("|")
+        self.queries.append(titles)
+        pages = []
+        for title in titles:
+            page = {"ns": 6, "title": title}
+            if title.removeprefix("File:") not in self.files:
+                page["missing"] = True
+            pages.append(page)
+        return FakeResponse({"batchcomplete": True, "query": {"pages": pages}})
+
+
+def test_normalize_file_title():
+    """
+    Test normalizing file names
+    """
+    assert normalize_file_title("File:Sw-ke-mbwa.flac") == "Sw-ke-mbwa.flac"
+    assert normalize_file_title("sw-ke-mti_mkubwa.flac\n") == "Sw-ke-mti mkubwa.flac"
+
+
+def test_read_file_list(tmp_path):
+    """
+    Test reading a list of Commons files
+    """
+    filename = tmp_path / "titles-in-ns6.gz"
+    with gzip.open(filename, "wt", encoding="utf-8") as list_fp:
+        list_fp.write("page_title\nSw-ke-mbwa.flac\nSw-ke-mti_mkubwa.flac\nFoo.jpg\n")
+    assert read_file_list(filename, prefix="Sw-ke-") == {
+        "Sw-ke-mbwa.flac",
+        "Sw-ke-mti mkubwa.flac",
+    }
+
+
+def test_resolver_batches(tmp_path):
+    """
+    Test that files are checked in batches and cached
+    """
+    files = {f"Sw-ke-{i}.flac" for i in range(0, 120, 2)}
+    titles = [f"Sw-ke-{i}.flac" for i in range(120)]
+    session = FakeSession(files)
+    resolver = CommonsResolver(tmp_path / "commons.json", session=session)
+    assert resolver.check(titles) == {title: title in files for title in titles}
+    assert [len(query) for query in session.queries] == [50, 50, 20]
+    # The results are read from the cache
+    session = FakeSession(set())
+    resolver = CommonsResolver(tmp_path / "commons.json", session=session)
+    assert resolver.exists("Sw-ke-0.flac")
+    assert not session.queries
+    # Expired results are checked again
+    resolver = CommonsResolver(tmp_path / "commons.json", ttl=-1, session=session)
+    assert not resolver.exists("Sw-ke-0.flac")
+    assert session.queries == [["File:Sw-ke-0.flac"]]
+
+
+def test_resolver_offline(tmp_path):
+    """
+    Test checking files against a local list
+    """
+    session = FakeSession(set())
+    resolver = CommonsResolver(
+        tmp_path / "commons.json", offline={"Sw-ke-mbwa.flac"}, session=session
+    )
+    assert resolver.check(["Sw-ke-mbwa.flac", "Sw-ke-paka.flac"]) == {
+        "Sw-ke-mbwa.flac": True,
+        "Sw-ke-paka.flac": False,
+    }
+    assert not session.queries
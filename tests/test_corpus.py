@@ -0,0 +1,35 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test functions for local corpora
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from kamusi import filename_to_title, iter_corpus, read_revids, title_to_filename
+
+
+def test_iter_corpus(tmp_path):
+    """
+    Test iter_corpus()
+    """
+    (tmp_path / "b").write_text("==English==\nb\n", encoding="utf-8")
+    (tmp_path / "a").write_text("==English==\na\n", encoding="utf-8")
+    (tmp_path / "subdir").mkdir()
+    assert list(iter_corpus(tmp_path)) == [
+        ("a", "==English==\na\n"),
+        ("b", "==English==\nb\n"),
+    ]
+
+
+def test_read_revids(tmp_path):
+    """
+    Test read_revids()
+    """
+    revids = tmp_path / "revids.tsv"
+    revids.write_text("AC/DC\t123\nfoo\t456\n", encoding="utf-8")
+    assert title_to_filename("AC/DC") == "AC_DC"
+    assert filename_to_title("AC_DC") == "AC/DC"
+    assert read_revids(revids) == {"AC_DC": ("AC/DC", 123), "foo": ("foo", 456)}
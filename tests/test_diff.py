@@ -0,0 +1,55 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test functions for diffs
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from kamusi import colour_diff, green, red, white
+
+OLD = "a\nb\nc\nd\ne\nThe quick brown fox\nf\n"
+NEW = "a\nb\nc\nd\ne\nThe quick red fox\nf\ng\n"
+
+
+def test_colour_diff():
+    """
+    Test colour_diff() with the default options
+    """
+    assert colour_diff("ab\n", "ac\n") == white("a") + red("b") + green("c") + white("\n")
+    assert colour_diff(OLD, OLD) == white(OLD)
+
+
+def test_colour_diff_plain():
+    """
+    Test colour_diff() without colours
+    """
+    assert colour_diff(OLD, NEW, colour=False) == (
+        "a\nb\nc\nd\ne\nThe quick [-b-]r[-own-]{+ed+} fox\nf\n{+g\n+}"
+    )
+    assert colour_diff(OLD, NEW, granularity="word", colour=False) == (
+        "a\nb\nc\nd\ne\nThe quick [-brown-]{+red+} fox\nf\n{+g\n+}"
+    )
+    assert colour_diff(OLD, NEW, granularity="line", colour=False) == (
+        "a\nb\nc\nd\ne\n[-The quick brown fox\n-]{+The quick red fox\n+}f\n{+g\n+}"
+    )
+
+
+def test_colour_diff_context():
+    """
+    Test that colour_diff() collapses unchanged lines
+    """
+    assert colour_diff(OLD, NEW, context=1, granularity="word", colour=False) == (
+        "@@ 4 unchanged lines @@\ne\nThe quick [-brown-]{+red+} fox\nf\n{+g\n+}"
+    )
+
+
+def test_colour_diff_timeout():
+    """
+    Test that colour_diff() shows whole lines once the time is up
+    """
+    assert colour_diff(OLD, NEW, timeout=0, colour=False) == (
+        colour_diff(OLD, NEW, granularity="line", colour=False)
+    )
@@ -8,7 +8,12 @@ Test hyphenation functions
 
 __license__ = "GPL-3.0-or-later"
 
-from kamusi import Hyphenation, get_hyphenations
+from kamusi import (
+    Hyphenation,
+    get_hyphenations,
+    get_lang_hyphenations,
+    validate_hyphenations,
+)
 
 
 def test_no_pattern():
@@ -358,3 +363,31 @@ def test_hyph_is_valid_yi():
     Test is_valid() for Yiddish
     """
     assert Hyphenation.create("קרעבס־עסער", ["קרעבס", "ע", "סער"], "yi").is_valid()
+
+
+def test_validate_hyphenations():
+    """
+    Test validate_hyphenations()
+    """
+    items = [
+        ("abbrechen", [["ab", "bre", "chen"], ["ab", "bre", "cen"]], "de"),
+        ("Daniël", [["Da", "ni", "el"]], "nl"),
+        ("Daniël", [["Da", "ni", "el"]], "en"),
+        ("wrong", [], "de"),
+    ]
+    assert list(validate_hyphenations(items)) == [
+        Hyphenation("abbrechen", ["ab", "bre", "cen"]),
+        Hyphenation("Daniël", ["Da", "ni", "el"]),
+    ]
+
+
+def test_lang_hyphenations():
+    """
+    Test that get_lang_hyphenations() finds the language of patterns
+    """
+    page = "{{hyph|de|ab|bre|chen}}\n{{es-pr|casa<hyph:ca.sa>}}\n{{hyph|nl|Da|ni|el}}"
+    assert list(get_lang_hyphenations(page)) == [
+        ("de", ["ab", "bre", "chen"]),
+        ("es", ["ca", "sa"]),
+        ("nl", ["Da", "ni", "el"]),
+    ]
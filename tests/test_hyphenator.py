@@ -0,0 +1,55 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test hyphenation with TeX patterns
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from kamusi import Hyphenator, parse_pattern
+
+# Patterns from Liang's thesis
+PATTERNS = ["hy3ph", "he2n", "hena4", "hen5at", "1na", "n2at", "1tio", "2io", "o2n"]
+
+
+def test_parse_pattern():
+    """
+    Test parse_pattern()
+    """
+    assert parse_pattern("hen5at") == ("henat", (0, 0, 0, 5, 0, 0))
+    assert parse_pattern(".ab1s") == (".abs", (0, 0, 0, 1, 0))
+
+
+def test_hyphenate():
+    """
+    Test Hyphenator.hyphenate()
+    """
+    hyphenator = Hyphenator(PATTERNS, left_min=2, right_min=3)
+    assert hyphenator.hyphenate("hyphenation") == ["hy", "phen", "ation"]
+    assert hyphenator.hyphenate("Hyphenation") == ["Hy", "phen", "ation"]
+    assert hyphenator.hyphenate("anti-hyphenation") == ["anti-hy", "phen", "ation"]
+    assert Hyphenator(PATTERNS, left_min=3).hyphenate("hyphenation") == ["hyphen", "ation"]
+
+
+def test_hyphenate_exceptions():
+    """
+    Test that exceptions override the patterns
+    """
+    hyphenator = Hyphenator(PATTERNS, ["hyphe-nation"])
+    assert hyphenator.hyphenate("Hyphenation") == ["Hyphe", "nation"]
+
+
+def test_from_file(tmp_path):
+    """
+    Test reading patterns in TeX format
+    """
+    filename = tmp_path / "hyph-xx.tex"
+    filename.write_text(
+        "% Liang\n\\patterns{\n" + "\n".join(PATTERNS) + "\n}\n\\hyphenation{ta-ble}\n",
+        encoding="utf-8",
+    )
+    hyphenator = Hyphenator.from_file(filename, right_min=3)
+    assert hyphenator.hyphenate("hyphenation") == ["hy", "phen", "ation"]
+    assert hyphenator.hyphenate("table") == ["ta", "ble"]
@@ -8,7 +8,11 @@ Test ISOF Swedish-Yiddish dictionary parsing
 
 __license__ = "GPL-3.0-or-later"
 
+import io
+import json
+
 from isofyi import get_gender, get_plural
+from isofyi import IsofDictionary, IsofRecord, get_data, iter_json_array
 from isofyi import parse_adjective, YiddishAdjective
 from isofyi import parse_adverb, YiddishAdverb
 from isofyi import parse_conjunction, YiddishConjunction
@@ -101,3 +105,50 @@ def test_parse_verb():
         "אָפּלויפֿן", "אָפּגעלאָפֿן"
     )
     assert parse_verb("זײַן") == YiddishVerb("זײַן", None)
+
+
+DATA = [
+    {"ID": "1", "sv": {"graminfo": "s"}, "yi": {"ord": {"Hebr": "הונט, דער [־ן]"}}},
+    {"ID": "2", "sv": {"graminfo": "vb"}, "yi": {"ord": {"Hebr": "זאָגן [געזאָגט]"}}},
+    {"ID": "3", "sv": {"graminfo": "adv"}, "yi": {"ord": {"Hebr": "גוט"}}},
+    {"ID": "4", "sv": {"graminfo": "adj"}, "yi": {"ord": {"Hebr": "גוט"}}},
+    {"ID": "5", "sv": {"graminfo": "räkn"}, "yi": {"ord": {"Hebr": "צוויי"}}},
+]
+
+
+def test_isof_dictionary():
+    """
+    Tests for the indexes of IsofDictionary
+    """
+    isof = IsofDictionary(IsofRecord.from_entry(entry) for entry in DATA)
+    assert len(isof) == 4
+    assert "גוט" in isof
+    assert isof.get_words("הונט") == [YiddishNoun("הונט", "m", "n")]
+    assert isof.get_words("גוט") == [YiddishAdverb("גוט"), YiddishAdjective("גוט")]
+    assert isof.get_words("קאַץ") == []
+    assert isof.get_nouns() == [YiddishNoun("הונט", "m", "n")]
+    assert isof.get_verbs() == [YiddishVerb("זאָגן", "געזאָגט")]
+    assert isof.get_pos("adj") == [YiddishAdjective("גוט")]
+    assert isof.get_entry_by_id(5) == IsofRecord(5, "räkn", "צוויי")
+    assert isof.get_entry_by_id(6) is None
+
+
+def test_iter_json_array():
+    """
+    Test reading a JSON array incrementally
+    """
+    text = json.dumps(DATA, ensure_ascii=False, indent=2)
+    assert list(iter_json_array(io.StringIO(text), chunk_size=7)) == DATA
+    assert list(iter_json_array(io.StringIO("[]"))) == []
+
+
+def test_get_data(tmp_path):
+    """
+    Test that get_data() returns records without the unused fields
+    """
+    filename = tmp_path / "job.json"
+    data = DATA + [{"ID": "6", "sv": {}, "yi": {"ord": {"Hebr": "\u2067אױ\u2069"}}}]
+    filename.write_text(json.dumps(data), encoding="utf-8")
+    records = list(get_data(filename))
+    assert len(records) == 5
+    assert records[0] == IsofRecord(1, "s", "הונט, דער [־ן]")
@@ -0,0 +1,79 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test functions for languages
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+import os
+
+from kamusi import FuzzyIndex, load_language_index, osa_distance
+
+CSV = """line;code;canonical name;category;type;family code;family;sortkey;autodetect;exceptional;script codes;other names;standard characters
+1;de;German;German language;regular;gmw;West Germanic;;;;Latn;High German,New High German;
+2;sw;Swahili;Swahili language;regular;bnt;Bantu;;;;Latn;Kiswahili;
+3;rw;Kinyarwanda;Kinyarwanda language;regular;bnt;Bantu;;;;Latn;;
+"""
+
+
+def test_language_index(tmp_path):
+    """
+    Test lookups in the language index
+    """
+    filename = tmp_path / "languages.csv"
+    filename.write_text(CSV, encoding="utf-8")
+    index = load_language_index(filename, tmp_path / "cache")
+    assert "German" in index
+    assert "Kiswahili" in index
+    assert "" not in index
+    assert index.get_code("High German") == "de"
+    assert index.get_code("Swahili") == "sw"
+    assert index.get_name("sw") == "Swahili"
+    # LANG_MAP overrides
+    assert index.get_name("rw") == "Rwanda-Rundi"
+    assert index.get_code("Rwanda-Rundi") == "rw"
+    assert index.get_code("Kinyarwanda") == "rw"
+
+
+def test_language_index_cache(tmp_path):
+    """
+    Test that the cached index is compiled again when the CSV file changes
+    """
+    filename = tmp_path / "languages.csv"
+    filename.write_text(CSV, encoding="utf-8")
+    load_language_index(filename, tmp_path / "cache")
+    assert (tmp_path / "cache" / "language-index.pickle").exists()
+    filename.write_text(CSV.replace("Kiswahili", "Kisuaheli"), encoding="utf-8")
+    os.utime(filename, ns=(0, 0))
+    index = load_language_index(filename, tmp_path / "cache")
+    assert "Kisuaheli" in index
+    assert "Kiswahili" not in index
+
+
+def test_osa_distance():
+    """
+    Test osa_distance()
+    """
+    assert osa_distance("German", "German") == 0
+    assert osa_distance("Gernam", "German") == 2
+    assert osa_distance("Arabjc", "Arabic") == 1
+    assert osa_distance("Itaian", "Italian") == 1
+    assert osa_distance("Swahili", "Swahilj", max_distance=0) == 1
+    assert osa_distance("kitten", "sitting") == 3
+    assert osa_distance("kitten", "sitting", max_distance=2) == 3
+
+
+def test_fuzzy_index():
+    """
+    Test suggestions of the fuzzy index
+    """
+    fuzzy = FuzzyIndex(["German", "Albanian", "Arabic", "Greek", "Portuguese", "Northern Sami"])
+    assert fuzzy.suggest("Albanisn") == ("Albanian", 1)
+    assert fuzzy.suggest("GReek") == ("Greek", 0)
+    assert fuzzy.suggest("Portuugese") == ("Portuguese", 1)
+    assert fuzzy.suggest("Northern Sámi") == ("Northern Sami", 1)
+    assert fuzzy.suggest("Klingon") is None
+    assert fuzzy.lookup("Arab") == [("Arabic", 2)]
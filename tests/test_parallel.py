@@ -0,0 +1,67 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test parallel processing functions
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from kamusi import imap_ordered, start_pool
+
+
+def square(x):
+    """
+    Return the square of a number (module level so it can be pickled)
+    """
+    return x * x
+
+
+def test_imap_ordered_single_process():
+    """
+    Test imap_ordered() without worker processes
+    """
+    assert list(imap_ordered(square, range(5), jobs=1)) == [0, 1, 4, 9, 16]
+
+
+def test_imap_ordered_keeps_order():
+    """
+    Test that imap_ordered() returns results in input order
+    """
+    items = range(1000)
+    result = imap_ordered(square, items, jobs=2, chunksize=7, window=3)
+    assert list(result) == [x * x for x in items]
+
+
+def test_imap_ordered_lazy_input():
+    """
+    Test that imap_ordered() only reads a bounded number of items ahead
+    """
+    consumed = []
+
+    def generate():
+        for i in range(10000):
+            consumed.append(i)
+            yield i
+
+    result = imap_ordered(square, generate(), jobs=2, chunksize=10, window=2)
+    assert next(result) == 0
+    assert len(consumed) <= 10 * 2 + 1
+    result.close()
+
+
+def test_imap_ordered_executor():
+    """
+    Test imap_ordered() with a pool started beforehand
+    """
+    assert start_pool(1) is None
+    executor = start_pool(2)
+    try:
+        assert list(imap_ordered(square, range(50), jobs=2, executor=executor)) == [
+            x * x for x in range(50)
+        ]
+        # The pool can be used again
+        assert list(imap_ordered(square, range(3), jobs=2, executor=executor)) == [0, 1, 4]
+    finally:
+        executor.shutdown()
@@ -0,0 +1,126 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test functions for the offline review queue
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from kamusi import get_entry
+from kamusi.review import APPLIED, STALE, dry_run, replace_entry, scan_corpus, update_page
+
+ENTRY = "==Swahili==\n\n===Noun===\n{{sw-noun}}\n\n# [[dog]]\n"
+
+
+def get_record(text):
+    """
+    Return a record for a change of the Swahili entry of a page, with
+    the entry stored like download/download does
+    """
+    old = get_entry(text, "sw", strip=True) + "\n"
+    new = old.replace("dog", "hound")
+    return {"title": "mbwa", "site": "en", "lang": "sw", "old": old, "new": new}
+
+
+def test_replace_entry_last_section():
+    """
+    Test replacing an entry at the end of a page without a trailing
+    newline (as stored by download/download)
+    """
+    text = "==English==\n\nfoo\n\n----\n\n" + ENTRY.rstrip()
+    assert replace_entry(get_record(text), text) == text.replace("dog", "hound")
+    text = ENTRY.rstrip()
+    assert replace_entry(get_record(text), text) == text.replace("dog", "hound")
+
+
+def test_replace_entry_middle():
+    """
+    Test replacing an entry followed by another language
+    """
+    text = ENTRY + "\n----\n\n==Zulu==\n\nbar"
+    assert replace_entry(get_record(text), text) == text.replace("dog", "hound")
+
+
+def test_replace_entry_stale():
+    """
+    Test that changed or missing entries aren't replaced
+    """
+    record = get_record(ENTRY)
+    assert replace_entry(record, ENTRY.replace("dog", "cat")) is None
+    assert replace_entry(record, "==English==\n\nfoo") is None
+
+
+class FakePage:
+    """
+    A page at a given revision
+    """
+
+    def __init__(self, text, revid):
+        self.text = text
+        self.latest_revision_id = revid
+        self.saved = False
+
+    def save(self, summary, minor=False):
+        """
+        Store the page
+        """
+        self.saved = True
+
+
+def test_update_page():
+    """
+    Test that a record is only applied to the revision it was created
+    from
+    """
+    record = get_record(ENTRY) | {"revid": 42, "changelog": "Fix", "minor": False}
+    page = FakePage(ENTRY, 43)
+    assert update_page(record, page) == STALE
+    assert not page.saved
+    assert page.text == ENTRY
+    page = FakePage(ENTRY, 42)
+    assert update_page(record, page) == APPLIED
+    assert page.saved
+    assert page.text == ENTRY.replace("dog", "hound")
+
+
+def add_link(entry):
+    """
+    A fixer for the tests
+    """
+    return entry.replace("dog", "[[dog]]")
+
+
+def test_scan_corpus(tmp_path):
+    """
+    Test that records use the page titles from the revisions
+    """
+    (tmp_path / "AC_DC").write_text(ENTRY.replace("[[dog]]", "dog"), encoding="utf-8")
+    (tmp_path / "unknown").write_text(ENTRY.replace("[[dog]]", "dog"), encoding="utf-8")
+    revids = {"AC_DC": ("AC/DC", 42)}
+    records = list(scan_corpus(add_link, tmp_path, "sw", "Add link", revids, jobs=1))
+    assert len(records) == 1
+    assert records[0]["title"] == "AC/DC"
+    assert records[0]["revid"] == 42
+    assert records[0]["new"] == ENTRY
+
+
+def add_title(title, entry):
+    """
+    A fixer taking the title for the tests
+    """
+    return entry.replace("dog", title)
+
+
+def test_dry_run_titles(tmp_path):
+    """
+    Test that fixers get the titles from the revisions or the file
+    names
+    """
+    (tmp_path / "AC_DC").write_text(ENTRY, encoding="utf-8")
+    (tmp_path / "a_b").write_text(ENTRY, encoding="utf-8")
+    revids = {"AC_DC": ("AC/DC", 42)}
+    results = list(dry_run([add_title], tmp_path, True, 1, revids))
+    assert [title for title, _, _ in results] == ["AC/DC", "a/b"]
+    assert results[0][2] == [(ENTRY.replace("dog", "AC/DC"), None)]
@@ -0,0 +1,154 @@
+# Copyright (C) 2026  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test Swahili functions
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+import mwparserfromhell
+
+from kamusi.sw import MorphologyIndex, SwAffix, add_missing_hyphen, parse_entry
+from kamusi.sw import find_derived_from, find_missing_hyphens, find_wrong_prefixes
+from kamusi.sw import get_audio_files, parse_audio, reconcile_audio
+
+ENTRIES = {
+    "kiimbo": """===Etymology===
+From {{af|sw|ki-|imba|-o}}.
+""",
+    "kisomo": """===Etymology===
+From {{af|sw|m-|soma|-o}}.
+""",
+    "uhusiano": """===Etymology===
+From {{af|sw|u|husiana<t:to be related>|-o}}.
+""",
+    "mapatano": """===Etymology===
+From {{m|sw|patana}} + {{m|sw|-o}}.
+""",
+    "mkutano": """===Noun===
+{{sw-noun}}
+""",
+    "tano": """===Numeral===
+{{sw-num}}
+""",
+    "kitano": """{{alt form|sw|kitani}}
+""",
+    "redio": """===Etymology===
+{{bor+|sw|en|radio}}
+""",
+}
+
+
+def get_index():
+    """
+    Return an index of the test entries
+    """
+    return MorphologyIndex(parse_entry(name, entry) for name, entry in ENTRIES.items())
+
+
+def test_parse_entry():
+    """
+    Test parsing the affixes and etymology of entries
+    """
+    entry = parse_entry("uhusiano", ENTRIES["uhusiano"])
+    assert entry.affixes == [SwAffix("af", ["u", "husiana", "-o"])]
+    assert entry.etymology == ["u", "husiana", "-o"]
+    entry = parse_entry("mapatano", ENTRIES["mapatano"])
+    assert entry.affixes == []
+    assert entry.etymology == ["patana", "-o"]
+    assert parse_entry("kitano", ENTRIES["kitano"]).is_alt_form
+    assert parse_entry("redio", ENTRIES["redio"]).is_borrowed
+    assert not parse_entry("foo", "{{bor+|sw|ar|foo}}").is_borrowed
+    assert parse_entry("foo", "{{af|en|ki-|foo}}").affixes == []
+
+
+def test_index_lookups():
+    """
+    Test looking up titles by prefix, suffix and component
+    """
+    index = get_index()
+    assert len(index) == len(ENTRIES)
+    assert "kiimbo" in index
+    assert index.with_prefix("ki") == ["kiimbo", "kisomo", "kitano"]
+    assert index.with_prefix("x") == []
+    assert index.with_suffix("tano") == ["kitano", "mapatano", "mkutano", "tano"]
+    assert index.with_component("-o") == ["kiimbo", "kisomo", "uhusiano"]
+
+
+def test_find_wrong_prefixes():
+    """
+    Test finding affix templates that don't match the noun class prefix
+    """
+    assert list(find_wrong_prefixes(get_index())) == [
+        ("kisomo", SwAffix("af", ["m-", "soma", "-o"]))
+    ]
+
+
+def test_find_missing_hyphens():
+    """
+    Test finding prefixes without hyphens
+    """
+    assert list(find_missing_hyphens(get_index())) == ["uhusiano"]
+
+
+def test_add_missing_hyphen():
+    """
+    Test that the same prefixes are fixed as found by
+    find_missing_hyphens()
+    """
+    for text, fixed in (
+        ("{{af|sw|u|husiana|-o}}", "{{af|sw|u-|husiana|-o}}"),
+        ("{{af|sw|u<t:foo>|husiana}}", "{{af|sw|u-<t:foo>|husiana}}"),
+        ("{{af|sw||husiana}}", None),
+        ("{{af|sw|ki-|imba}}", None),
+        ("{{af|en|u|foo}}", None),
+    ):
+        template = mwparserfromhell.parse(text).filter_templates()[0]
+        assert add_missing_hyphen(template) == (fixed is not None)
+        assert str(template) == (fixed or text)
+        assert parse_entry("foo", "From " + text + ".").missing_hyphen == (fixed is not None)
+
+
+def test_find_derived_from():
+    """
+    Test finding nouns in -ano without a verb in -ana in the etymology
+    """
+    assert list(find_derived_from(get_index(), "ano", "ana", ["tano"])) == ["mkutano"]
+
+
+def test_parse_audio():
+    """
+    Test extracting the entry name from audio files
+    """
+    assert parse_audio("Sw-ke-mti_mkubwa.flac") == "mti mkubwa"
+    assert parse_audio("Sw-mújibu.oga") == "mujibu"
+
+
+def test_get_audio_files():
+    """
+    Test finding the audio files of an entry
+    """
+    entry = """* {{audio|sw|Sw-ke-mbwa.flac|a=Kenya}}
+*{{uttal|sw|region=Kenya|ljud=Sw-ke-paka.flac}}
+"""
+    assert get_audio_files(entry) == ["Sw-ke-mbwa.flac", "Sw-ke-paka.flac"]
+    assert get_audio_files("{{audio|sw}}") == []
+
+
+def test_reconcile_audio():
+    """
+    Test reconciling the audio of entries with available files
+    """
+    entries = [
+        ("mbwa", "{{audio|sw|Sw-ke-mbwa.flac}}"),
+        ("paka", "{{audio|sw|Sw-ke-mbwa.flac}}"),
+        ("mti mkubwa", "{{sw-noun}}"),
+        ("simba", "{{sw-noun}}"),
+    ]
+    files = ["Sw-ke-mbwa.flac", "Sw-ke-mti_mkubwa.flac", "Sw-ke-twiga.flac"]
+    report = reconcile_audio(entries, files)
+    assert report.mismatched == [("paka", "Sw-ke-mbwa.flac")]
+    assert report.missing == [("mti mkubwa", ["Sw-ke-mti mkubwa.flac"])]
+    assert report.orphans == ["Sw-ke-twiga.flac"]
@@ -0,0 +1,193 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test translation table functions
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+from kamusi import TRANSLATION_RULES, fix_translations, translations_changelog
+from kamusi import apply_edits, parse_translations
+
+ENTRY = """===Translations===
+{{trans-top|foo}}
+* Gernam: {{t|de|Foo}},{{t|de|Bar}}
+
+* French : {{t|fr|foo}}. {{t|fr|bar}}
+{{trans-bottom}}
+{{checktrans-top}}
+{{t|sw|foo}}
+{{other}}
+"""
+
+
+def test_single_rule():
+    """
+    Test that a single rule only changes what it should
+    """
+    text, applied = fix_translations(ENTRY, [TRANSLATION_RULES["whitespace"]])
+    assert applied == ["whitespace"]
+    assert text == ENTRY.replace("}},{{", "}}, {{")
+
+
+def test_no_change():
+    """
+    Test that lines outside of translation tables are left alone
+    """
+    entry = "* Gernam: {{t|de|Foo}},{{t|de|Bar}}\n"
+    assert fix_translations(entry) == (entry, [])
+
+
+def test_all_rules():
+    """
+    Test all rules in a single pass
+    """
+    text, applied = fix_translations(ENTRY)
+    assert text == """===Translations===
+{{trans-top|foo}}
+* German: {{t|de|Foo}}, {{t|de|Bar}}
+* French: {{t|fr|foo}}, {{t|fr|bar}}
+{{trans-bottom}}
+{{checktrans-top}}
+* Swahili: {{t|sw|foo}}
+{{trans-bottom}}
+{{other}}
+"""
+    assert translations_changelog(applied) == (
+        "/* Translations */ Remove empty lines in translation; Fix syntax error; "
+        "Fix language name; Fix separation of translations; "
+        "Add space between translations; Fix cosmetic issues; Add missing trans-bottom"
+    )
+
+
+def test_empty_line_ends_table():
+    """
+    Test that an empty line ends a table unless a rule handles it
+    """
+    entry = "{{trans-top|foo}}\n* Dutch: {{t|nl|a}}\n\n{{t|nl|b}},{{t|nl|c}}\n"
+    text, _ = fix_translations(entry, [TRANSLATION_RULES["whitespace"]])
+    assert text == entry
+
+
+def test_missing_trans_bottom():
+    """
+    Test that all rules keep the empty line before a header when they
+    add a missing {{trans-bottom}}
+    """
+    entry = "{{trans-top|foo}}\n* Dutch: {{t|nl|a}}\n\n* German: {{t|de|b}}\n\n====Synonyms====\n"
+    text, applied = fix_translations(entry)
+    assert text == (
+        "{{trans-top|foo}}\n* Dutch: {{t|nl|a}}\n* German: {{t|de|b}}\n"
+        "{{trans-bottom}}\n\n====Synonyms====\n"
+    )
+    assert applied == ["empty-lines", "trans-bottom"]
+
+
+def test_known_lang_names():
+    """
+    Test that lines with correct language names aren't changed
+    """
+    entry = "{{trans-top|foo}}\n* German:{{t|de|a}}\n* Gernan:{{t|de|b}}\n{{trans-bottom}}\n"
+    text, applied = fix_translations(entry, [TRANSLATION_RULES["language"]])
+    assert text == entry.replace("Gernan:", "German: ")
+    assert fix_translations(entry.replace("Gernan", "German"), [TRANSLATION_RULES["language"]]) == (
+        entry.replace("Gernan", "German"),
+        [],
+    )
+
+
+TABLES = """===Translations===
+{{trans-top|a [[foo]] thing}}
+* Chinese:
+*: Mandarin: {{t|cmn|中}}
+* German: {{t+|de|Foo|m}}, {{t|de|Bar|alt=bar}}
+{{trans-bottom}}
+{{checktrans-top}}
+* French: {{t|fr|foo}}
+
+===See also===
+"""
+
+
+def test_parse_translations():
+    """
+    Test parse_translations()
+    """
+    tables = list(parse_translations(TABLES))
+    assert len(tables) == 2
+    assert tables[0].gloss == "a [[foo]] thing"
+    assert tables[0].closed
+    assert TABLES[tables[0].start : tables[0].end].endswith("{{trans-bottom}}\n")
+    assert [(line.depth, line.lang) for line in tables[0].lines] == [
+        (1, "Chinese"),
+        (2, "Mandarin"),
+        (1, "German"),
+    ]
+    items = tables[0].lines[2].items
+    assert [(item.template, item.lang_code, item.term) for item in items] == [
+        ("t+", "de", "Foo"),
+        ("t", "de", "Bar"),
+    ]
+    assert TABLES[items[0].start : items[0].end] == "{{t+|de|Foo|m}}"
+    assert not tables[1].closed
+    assert TABLES[tables[1].start : tables[1].end] == (
+        "{{checktrans-top}}\n* French: {{t|fr|foo}}\n"
+    )
+
+
+def test_apply_edits():
+    """
+    Test writing changes back with apply_edits()
+    """
+    table = next(parse_translations(TABLES))
+    edits = [
+        (item.start, item.end, "{{t|" + item.lang_code + "|" + item.term.upper() + "}}")
+        for line in table.lines
+        for item in line.items
+    ]
+    text = apply_edits(TABLES, edits)
+    assert "* German: {{t|de|FOO}}, {{t|de|BAR}}\n" in text
+    assert "*: Mandarin: {{t|cmn|中}}\n" in text
+
+
+def test_same_boundaries():
+    """
+    Test that fix_translations() and parse_translations() end a table
+    without {{trans-bottom}} at the same line
+    """
+    entry = """{{trans-top|foo}}
+* Dutch: {{t|nl|a}},{{t|nl|b}}
+{{trans-mid}}
+* German: {{t|de|a}},{{t|de|b}}
+====Related terms====
+* Dutch: {{t|nl|a}},{{t|nl|b}}
+"""
+    table = next(parse_translations(entry))
+    assert entry[table.start : table.end].endswith("* German: {{t|de|a}},{{t|de|b}}\n")
+    text, _ = fix_translations(entry, [TRANSLATION_RULES["whitespace"]])
+    assert text == entry.replace("}},{{", "}}, {{", 2)
+    text, _ = fix_translations(entry, [TRANSLATION_RULES["trans-bottom"]])
+    assert text == entry.replace("====Related", "{{trans-bottom}}\n====Related")
+
+
+def test_gloss():
+    """
+    Test that the gloss is the first positional parameter of trans-top
+    """
+    entry = "{{trans-top|id=Q1|a [[foo|bar]] thing}}\n* Dutch: {{t|nl|a}}\n{{trans-bottom}}\n"
+    assert next(parse_translations(entry)).gloss == "a [[foo|bar]] thing"
+    assert next(parse_translations("{{checktrans-top}}\n")).gloss == ""
+
+
+def test_checktrans_tables():
+    """
+    Test that separation and whitespace are also fixed in
+    {{checktrans-top}} tables
+    """
+    entry = "{{checktrans-top}}\n* German: {{t|de|a}}. {{t|de|b}},{{t|de|c}}\n{{trans-bottom}}\n"
+    rules = [TRANSLATION_RULES["separation"], TRANSLATION_RULES["whitespace"]]
+    text, applied = fix_translations(entry, rules)
+    assert text == entry.replace("}}. {{", "}}, {{").replace("}},{{", "}}, {{")
+    assert applied == ["separation", "whitespace"]
@@ -0,0 +1,71 @@
+# Copyright (C) 2024  Martin Michlmayr <tbm@cyrius.com>
+# License: GNU General Public License (GPL), version 3 or above
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Test the comparison of Yiddish words from several sources
+"""
+
+__license__ = "GPL-3.0-or-later"
+
+import json
+
+from kamusi.yi_compare import compare_words, load_dictionary
+from isofyi import YiddishNoun, YiddishVerb
+
+
+def test_compare_words():
+    """
+    Test comparing one sense per source
+    """
+    sources = [[YiddishNoun("הונט", "m", "n")], [YiddishNoun("הונט", "f", None)]]
+    assert list(compare_words("הונט", sources)) == [
+        ("gender", "הונט", "m", "f"),
+        ("plural", "הונט", "n", None),
+    ]
+    assert list(compare_words("הונט", sources, {YiddishNoun: ("gender",)})) == [
+        ("gender", "הונט", "m", "f"),
+    ]
+
+
+def test_compare_words_senses():
+    """
+    Test that senses are matched before they are compared
+    """
+    sources = [
+        [YiddishNoun("באַנק", "f", "en"), YiddishNoun("באַנק", "m", "s")],
+        [YiddishNoun("באַנק", "m", "s"), YiddishNoun("באַנק", "f", "n")],
+    ]
+    assert list(compare_words("באַנק", sources)) == [("plural", "באַנק", "en", "n")]
+
+
+def test_compare_words_three_sources():
+    """
+    Test comparing three sources, one of which doesn't have the word
+    """
+    sources = [
+        [YiddishVerb("זאָגן", "געזאָגט")],
+        [],
+        [YiddishNoun("זאָגן", "n", None), YiddishVerb("זאָגן", "געזאָגן")],
+    ]
+    assert list(compare_words("זאָגן", sources)) == [
+        ("past participle", "זאָגן", "געזאָגט", None, "געזאָגן"),
+    ]
+
+
+def test_load_dictionary(tmp_path):
+    """
+    Test that the parsed dictionary is cached until the JSON changes
+    """
+    data = [
+        {"ID": "1", "sv": {"graminfo": "s"}, "yi": {"ord": {"Hebr": "הונט, דער [־ן]"}}},
+        {"ID": "2", "sv": {"graminfo": "vb"}, "yi": {"ord": {"Hebr": "זאָגן [געזאָגט]"}}},
+    ]
+    filename = tmp_path / "job.json"
+    filename.write_text(json.dumps(data), encoding="utf-8")
+    isof = load_dictionary(filename, tmp_path / "cache")
+    assert isof.get_nouns() == [YiddishNoun("הונט", "m", "n")]
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 1
+    assert load_dictionary(filename, tmp_path / "cache").get_nouns() == isof.get_nouns()
+    filename.write_text(json.dumps(data[1:]), encoding="utf-8")
+    assert load_dictionary(filename, tmp_path / "cache").get_nouns() == []
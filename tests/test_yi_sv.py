@@ -9,8 +9,12 @@ Test Yiddish functions (Swedish Wiktionary)
 __license__ = "GPL-3.0-or-later"
 
 import mwparserfromhell
+import pytest
 
 from kamusi.yi_sv import get_noun_section, get_gender, get_noun, get_verb
+from kamusi.yi_sv import get_gender_from_names, iter_parts, parse_entry
+from kamusi.yi_sv import add_noun_gender, add_noun_plural, gen_gender_str
+from kamusi.yi_sv import apply_noun_changes, read_noun_changes
 from isofyi import YiddishNoun, YiddishVerb
 
 YI_SV_NOUN_1 = """==Jiddisch==
@@ -128,3 +132,132 @@ def test_get_verb():
 #[[foo]]
    """
     assert get_verb("Foo", entry) == YiddishVerb("Foo", None)
+
+
+def test_get_gender_from_names():
+    """
+    Test get_gender_from_names()
+    """
+    assert get_gender_from_names(["subst", "m", "f"]) == "mf"
+    assert get_gender_from_names(["yi-subst-n-s", "subst", "n"]) == "n"
+    assert get_gender_from_names(["subst"]) is None
+
+
+def test_iter_parts():
+    """
+    Test iter_parts()
+    """
+    assert [(part.pos, part.templates) for part in iter_parts(YI_SV_NOUN_3)] == [
+        ("Substantiv", ["subst"]),
+    ]
+
+
+def test_parse_entry():
+    """
+    Test parse_entry() with several parts
+    """
+    entry = """==Jiddisch==
+===Substantiv===
+{{subst|yi}}
+'''foo''' (foo) {{m}}
+#[[foo]]
+{{subst|yi}}
+'''foo''' (foo) {{f}} ''eller'' {{n}}
+#[[bar]]
+
+===Verb===
+{{verb|yi}}
+'''foo''' (foo)
+#[[baz]]
+"""
+    assert list(parse_entry("Foo", entry)) == [
+        YiddishNoun("Foo", "m", None),
+        YiddishNoun("Foo", "fn", None),
+        YiddishVerb("Foo", None),
+    ]
+
+
+def test_gen_gender_str():
+    """
+    Test gender templates
+    """
+    assert gen_gender_str("m") == "{{m}}"
+    assert gen_gender_str("mf") == "{{mf}}"
+    assert gen_gender_str("fn") == "{{f}} ''eller'' {{n}}"
+
+
+def test_add_noun_gender():
+    """
+    Test adding the gender to a noun
+    """
+    assert add_noun_gender(YI_SV_NOUN_1, "m") == YI_SV_NOUN_1.replace(
+        "(foo)", "(foo) {{m}}"
+    )
+    with pytest.raises(ValueError):
+        add_noun_gender(YI_SV_NOUN_1.replace("(foo)", "(foo) {{f}}"), "m")
+    # The gender has to match {{yi-subst-X-Y}}
+    subst = YI_SV_NOUN_1.replace("{{subst|yi}}", "{{yi-subst-m-s}}")
+    assert add_noun_gender(subst, "m") == subst.replace("(foo)", "(foo) {{m}}")
+    with pytest.raises(ValueError):
+        add_noun_gender(subst, "f")
+
+
+def test_add_noun_plural():
+    """
+    Test adding the plural to a noun
+    """
+    assert add_noun_plural("foo", YI_SV_NOUN_1, "m", "s") == YI_SV_NOUN_1.replace(
+        "{{subst|yi}}", "{{yi-subst-m-s}}"
+    )
+    with pytest.raises(NotImplementedError):
+        add_noun_plural("פֿאָן", YI_SV_NOUN_1, "m", "s")
+    # Raw ISOF suffixes and full plurals aren't supported by the template
+    with pytest.raises(ValueError):
+        add_noun_plural("foo", YI_SV_NOUN_1, "m", "־ות")
+    with pytest.raises(ValueError):
+        add_noun_plural("foo", YI_SV_NOUN_1, "m", "פֿאָנען")
+
+
+def test_read_noun_changes():
+    """
+    Test reading changes from mismatch rows
+    """
+    rows = [
+        ["gender", "foo", "f", "m"],
+        ["plural", "foo", "", "en"],
+        ["plural", "bar", "s", ""],
+        ["past participle", "baz", "a", "b"],
+    ]
+    assert read_noun_changes(rows) == {"foo": {"gender": "m", "plural": "en"}}
+    # Rows from compare_sources have a column for every source
+    with pytest.raises(ValueError):
+        read_noun_changes([["gender", "foo", "m", "f", "f"]])
+
+
+def test_apply_noun_changes():
+    """
+    Test applying gender and plural changes to a noun
+    """
+    entry, descriptions = apply_noun_changes(
+        "foo", YI_SV_NOUN_1, {"gender": "m", "plural": "s"}
+    )
+    assert entry == YI_SV_NOUN_1.replace("{{subst|yi}}", "{{yi-subst-m-s}}").replace(
+        "(foo)", "(foo) {{m}}"
+    )
+    assert descriptions == ["gender", "plural"]
+    # The gender is taken from the entry
+    entry, descriptions = apply_noun_changes(
+        "foo", YI_SV_NOUN_1.replace("(foo)", "(foo) {{f}}"), {"plural": "en"}
+    )
+    assert "{{yi-subst-f-en}}" in entry
+    assert descriptions == ["plural"]
+    with pytest.raises(ValueError):
+        apply_noun_changes("foo", YI_SV_NOUN_1, {"plural": "en"})
+    with pytest.raises(ValueError):
+        apply_noun_changes("foo", YI_SV_NOUN_1, {"gender": "m", "plural": "־ות"})
+    assert apply_noun_changes("foo", YI_SV_NOUN_1, {}) == (YI_SV_NOUN_1, [])
+    # Only what was added is described
+    entry = YI_SV_NOUN_1.replace("{{subst|yi}}\n", "")
+    entry, descriptions = apply_noun_changes("foo", entry, {"gender": "m", "plural": "s"})
+    assert "{{yi-subst-" not in entry
+    assert descriptions == ["gender"]